@@ -2,7 +2,11 @@ from pydantic import BaseModel
 import os
 from openai import OpenAI
 import dotenv
-from utils.interface import get_YFin_data_online, get_stock_stats_indicators_window
+from utils.interface import (
+    get_YFin_data_online,
+    get_stock_stats_indicators_window,
+    get_stock_stats_indicators_batch,
+)
 from typing import Annotated
 from agents import Agent, function_tool
 
@@ -28,6 +32,16 @@ def get_stock_stats_indicators_window_tool(
     print(f"DEBUG: get_stock_stats_indicators_window called with symbol: {symbol}, indicator: {indicator}, curr_date: {curr_date}, look_back_days: {look_back_days}")
     return get_stock_stats_indicators_window(symbol, indicator, curr_date, look_back_days)
 
+@function_tool
+def get_stock_stats_indicators_batch_tool(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicators: Annotated[list[str], "technical indicators to get the analysis and report of"],
+    curr_date: Annotated[str, "The current trading date you are trading on, YYYY-mm-dd"],
+    look_back_days: Annotated[int, "how many days to look back"],
+):
+    print(f"DEBUG: get_stock_stats_indicators_batch called with symbol: {symbol}, indicators: {indicators}, curr_date: {curr_date}, look_back_days: {look_back_days}")
+    return get_stock_stats_indicators_batch(symbol, indicators, curr_date, look_back_days)
+
 # Market analysis agent focused on technical analysis and market trends
 MARKET_PROMPT = (
     "You are a trading assistant tasked with analyzing financial markets. Your role is to select the **most relevant indicators** for a given market condition or trading strategy from the following list. The goal is to choose up to **8 indicators** that provide complementary insights without redundancy. Categories and each category's indicators are:\n\n"
@@ -48,7 +62,7 @@ MARKET_PROMPT = (
     "- atr: ATR: Averages true range to measure volatility. Usage: Set stop-loss levels and adjust position sizes based on current market volatility. Tips: It's a reactive measure, so use it as part of a broader risk management strategy.\n\n"
     "Volume-Based Indicators:\n"
     "- vwma: VWMA: A moving average weighted by volume. Usage: Confirm trends by integrating price action with volume data. Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses.\n\n"
-    "Select indicators that provide diverse and complementary information. Avoid redundancy (e.g., do not select both rsi and stochrsi). Also briefly explain why they are suitable for the given market context. When you tool call, please use the exact name of the indicators provided above as they are defined parameters, otherwise your call will fail. Please make sure to call get_YFin_data first to retrieve the CSV that is needed to generate indicators. Write a very detailed and nuanced report of the trends you observe. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions. Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read.\n\n"
+    "Select indicators that provide diverse and complementary information. Avoid redundancy (e.g., do not select both rsi and stochrsi). Also briefly explain why they are suitable for the given market context. When you tool call, please use the exact name of the indicators provided above as they are defined parameters, otherwise your call will fail. Fetch all selected indicators with a single get_stock_stats_indicators_batch_tool call rather than one get_stock_stats_indicators_window_tool call per indicator. Please make sure to call get_YFin_data first to retrieve the CSV that is needed to generate indicators. Write a very detailed and nuanced report of the trends you observe. Do not simply state the trends are mixed, provide detailed and finegrained analysis and insights that may help traders make decisions. Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read.\n\n"
     "Based on your analysis, provide a specific recommendation to buy, sell, or hold. End with a firm decision and always conclude your response with 'FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**' to confirm your recommendation."
 )
 
@@ -63,5 +77,9 @@ market_agent = Agent(
     instructions=MARKET_PROMPT,
     model="gpt-4o",
     output_type=MarketAnalysisSummary,
-    tools=[get_YFin_data_online_tool, get_stock_stats_indicators_window_tool]
+    tools=[
+        get_YFin_data_online_tool,
+        get_stock_stats_indicators_batch_tool,
+        get_stock_stats_indicators_window_tool,
+    ]
 ) 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 import os
-from utils.interface import get_google_news, get_crypto_rss_feeds
+from utils.interface import get_google_news, get_crypto_rss_feeds_async
 from typing import Annotated
 from agents import Agent, function_tool
 import finnhub
@@ -10,6 +10,11 @@ dotenv.load_dotenv()
 
 finnhub_client = finnhub.Client(api_key=os.getenv("FINNHUB_API_KEY"))
 
+# News tools return compact, token-budgeted text instead of raw JSON; set
+# NEWS_TOOL_COMPACT=0 to get the full JSON payload back.
+NEWS_TOOL_COMPACT = os.getenv("NEWS_TOOL_COMPACT", "1") != "0"
+NEWS_TOOL_TOKEN_BUDGET = int(os.getenv("NEWS_TOOL_TOKEN_BUDGET", "3000"))
+
 @function_tool
 def finhub_company_news_tool(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -29,11 +34,14 @@ def get_google_news_tool(
     return get_google_news(query, curr_date, look_back_days)
 
 @function_tool
-def get_crypto_rss_feeds_tool(
+async def get_crypto_rss_feeds_tool(
     ticker: Annotated[str, "ticker symbol of the crypto asset"],
 ):
     print(f"DEBUG: get_crypto_rss_feeds_tool called with ticker: {ticker}")
-    return get_crypto_rss_feeds(ticker)
+    # Awaited: the tool runs inside the SDK's event loop, which fetch_feeds would block
+    return await get_crypto_rss_feeds_async(
+        ticker, compact=NEWS_TOOL_COMPACT, token_budget=NEWS_TOOL_TOKEN_BUDGET
+    )
    
 
 
@@ -0,0 +1,31 @@
+from utils.crypto_news_index import CryptoNewsIndex
+
+
+def index_of(*entries):
+    index = CryptoNewsIndex()
+    for article_id, (title, summary) in enumerate(entries):
+        index.add(article_id, {"title": title, "summary": summary})
+    return index
+
+
+def test_multi_word_alias_must_appear_as_a_phrase():
+    index = index_of(
+        ("Binance lists a new meme coin", "Trading starts at 10:00 UTC."),
+        ("USD stablecoin supply grows", "Every coin is backed 1:1."),
+        ("Binance Coin hits a record", ""),
+        ("Circle mints $1B of USD Coin", ""),
+    )
+    assert index.lookup("BNB") == {2}
+    assert index.lookup("USDC") == {3}
+
+
+def test_phrase_does_not_span_title_and_summary():
+    index = index_of(("Fees on Bitcoin", "Cash withdrawals slow down"), ("Bitcoin Cash forks", ""))
+    assert index.lookup("BCH") == {1}
+
+
+def test_single_token_aliases_match_anywhere():
+    index = index_of(("Markets wait on the Fed", "<p>$ETH and BTC rally.</p>"), ("Solana outage", ""))
+    assert index.lookup("eth") == {0}
+    assert index.lookup("BTC") == {0}
+    assert index.lookup("DOGE") == set()
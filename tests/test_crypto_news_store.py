@@ -0,0 +1,71 @@
+import json
+
+from utils.crypto_news_store import CryptoNewsStore, content_hash, normalize_link
+
+
+def entry(title, link, summary="", guid=""):
+    return {"title": title, "link": link, "summary": summary, "guid": guid, "published": ""}
+
+
+def test_syndicated_copy_from_another_feed_is_dropped(tmp_path):
+    store = CryptoNewsStore(str(tmp_path / "articles.jsonl"))
+    first = entry("Bitcoin ETF sees record inflows", "https://a.com/btc-etf", "<p>Inflows hit $1B.</p>")
+    copy = entry("Bitcoin ETF Sees Record Inflows!", "https://b.com/news/123", "Inflows hit $1B.")
+    assert len(store.ingest([first])) == 1
+    assert store.ingest([copy]) == []
+
+
+def test_recurring_headline_with_new_content_is_kept(tmp_path):
+    store = CryptoNewsStore(str(tmp_path / "articles.jsonl"))
+    store.ingest([entry("Bitcoin Price Today", "https://a.com/1", "BTC trades at $60,000")])
+    added = store.ingest([entry("Bitcoin Price Today", "https://a.com/2", "BTC trades at $62,000")])
+    assert [a["link"] for a in added] == ["https://a.com/2"]
+
+
+def test_untitled_entries_are_not_deduplicated_by_content(tmp_path):
+    store = CryptoNewsStore(str(tmp_path / "articles.jsonl"))
+    assert content_hash(entry("No title", "https://a.com/1")) is None
+    added = store.ingest([entry("No title", "https://a.com/1"), entry("No title", "https://a.com/2")])
+    assert len(added) == 2
+
+
+def test_content_hash_expires_after_window(tmp_path):
+    store = CryptoNewsStore(str(tmp_path / "articles.jsonl"), hash_window=0)
+    store.ingest([entry("Crypto market update", "https://a.com/1", "Same text")])
+    store.hashes = {digest: at - 1 for digest, at in store.hashes.items()}
+    assert len(store.ingest([entry("Crypto market update", "https://b.com/1", "Same text")])) == 1
+
+
+def test_tracking_params_match_exact_names():
+    assert normalize_link("https://www.a.com/x/?utm_source=tw&ref=home&id=3") == "a.com/x?id=3"
+    assert normalize_link("https://a.com/x?reference=7&sourceId=9") == "a.com/x?reference=7&sourceId=9"
+
+
+def test_cursor_returns_only_newer_articles(tmp_path):
+    store = CryptoNewsStore(str(tmp_path / "articles.jsonl"))
+    store.ingest([entry("Ethereum upgrade ships", "https://a.com/1"), entry("Solana outage", "https://a.com/2")])
+    articles, cursor = store.get_since(0)
+    assert [a["seq"] for a in articles] == [1, 2] and cursor == 2
+
+    assert store.get_since(cursor) == ([], 2)
+    store.ingest([entry("Bitcoin halving nears", "https://a.com/3")])
+    articles, cursor = store.get_since(cursor)
+    assert [a["title"] for a in articles] == ["Bitcoin halving nears"] and cursor == 3
+
+    articles, _ = store.get_since(0, ticker="ETH")
+    assert [a["seq"] for a in articles] == [1]
+    assert store.get_since(1, ticker="ETH")[0] == []
+
+
+def test_truncated_trailing_line_is_skipped(tmp_path):
+    path = tmp_path / "articles.jsonl"
+    store = CryptoNewsStore(str(path))
+    store.ingest([entry("Ethereum upgrade ships", "https://a.com/1")])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"title": "Solana out')
+
+    reloaded = CryptoNewsStore(str(path))
+    assert [a["seq"] for a in reloaded.articles] == [1]
+    reloaded.ingest([entry("Solana outage", "https://a.com/2")])
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["seq"] for line in lines] == [1, 2]
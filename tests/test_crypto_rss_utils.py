@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import crypto_rss_utils, http_client
+from utils.crypto_rss_utils import extract_feed_entries, fetch_feeds, fetch_feeds_async
+
+
+class TrickleHandler(BaseHTTPRequestHandler):
+    """Answers 200 at once, then sends one byte every 0.1s for ten seconds."""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.end_headers()
+        try:
+            for _ in range(100):
+                self.wfile.write(b" ")
+                self.wfile.flush()
+                time.sleep(0.1)
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def trickle_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(crypto_rss_utils, "FEED_CACHE_DIR", str(tmp_path))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TrickleHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/feed"
+    server.shutdown()
+    server.server_close()
+
+
+def test_slow_body_is_abandoned_at_the_feed_timeout(trickle_url):
+    start = time.monotonic()
+    assert extract_feed_entries(trickle_url, timeout=0.5, ttl=0) == []
+    assert time.monotonic() - start < 2
+
+
+def test_worker_is_freed_at_the_batch_deadline(trickle_url):
+    start = time.monotonic()
+    results = fetch_feeds([trickle_url], feed_timeout=30, deadline=0.5, ttl=0)
+    assert results == {trickle_url: []}
+
+    # The abandoned request stops on its own instead of holding the pool worker
+    crypto_rss_utils._get_executor().submit(lambda: None).result(timeout=2)
+    assert time.monotonic() - start < 2.5
+
+
+def test_feed_queued_past_the_deadline_makes_no_request(trickle_url):
+    start = time.monotonic()
+    assert extract_feed_entries(trickle_url, ttl=0, deadline_at=time.monotonic()) == []
+    assert time.monotonic() - start < 0.2
+
+
+def test_blocking_fetch_refuses_to_run_inside_an_event_loop():
+    async def main():
+        with pytest.raises(RuntimeError, match="fetch_feeds_async"):
+            fetch_feeds([])
+        return await fetch_feeds_async([])
+
+    assert asyncio.run(main()) == {}
+
+
+FEED = (
+    b'<?xml version="1.0"?><rss version="2.0"><channel>'
+    b"<item><title>Bitcoin tops $100k</title><link>https://a.com/1</link></item>"
+    b"</channel></rss>"
+)
+
+
+def http2_client(monkeypatch, transport=None):
+    """A client whose http:// requests go through Http2Adapter, as https:// ones do in production."""
+    pytest.importorskip("h2")
+    client = http_client.HttpClient(http2=True)
+    client.session.mount("http://", http_client.Http2Adapter(transport=transport))
+    monkeypatch.setattr(crypto_rss_utils, "get_http_client", lambda: client)
+    return client
+
+
+def test_http2_slow_body_is_abandoned_at_the_feed_timeout(trickle_url, monkeypatch):
+    http2_client(monkeypatch)
+    start = time.monotonic()
+    assert extract_feed_entries(trickle_url, timeout=0.5, ttl=0) == []
+    assert time.monotonic() - start < 2
+
+
+def test_http2_not_modified_refreshes_the_cache(tmp_path, monkeypatch):
+    import httpx
+
+    monkeypatch.setattr(crypto_rss_utils, "FEED_CACHE_DIR", str(tmp_path))
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=FEED)
+
+    http2_client(monkeypatch, transport=httpx.MockTransport(handler))
+    url = "http://feeds.example/rss"
+    assert [e["title"] for e in extract_feed_entries(url, ttl=0)] == ["Bitcoin tops $100k"]
+    first_fetch = crypto_rss_utils.load_cached_feed(url)["fetched_at"]
+
+    assert [e["title"] for e in extract_feed_entries(url, ttl=0)] == ["Bitcoin tops $100k"]
+    assert crypto_rss_utils.load_cached_feed(url)["fetched_at"] > first_fetch
+
+    # Within the TTL after the 304 the feed is served from the cache
+    extract_feed_entries(url, ttl=300)
+    assert len(requests_seen) == 2
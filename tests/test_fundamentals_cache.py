@@ -0,0 +1,75 @@
+import time
+
+import pandas as pd
+import pytest
+
+from utils import fundamentals_cache as fc
+from utils.fundamentals_cache import EARNINGS_GRACE, FundamentalsCache
+
+
+class FakeTickers:
+    """ticker_factory whose tickers serve `values` and count every fetch per dataset."""
+
+    def __init__(self):
+        self.fetches = {}
+        self.values = {
+            "financials": pd.DataFrame({"2024": [1.0, 2.0]}, index=["Revenue", "Net Income"]),
+            "calendar": {},
+        }
+
+    def __call__(self, symbol):
+        tickers = self
+
+        class Ticker:
+            def __getattr__(self, dataset):
+                tickers.fetches[dataset] = tickers.fetches.get(dataset, 0) + 1
+                value = tickers.values[dataset]
+                if isinstance(value, Exception):
+                    raise value
+                return value
+
+        return Ticker()
+
+
+@pytest.fixture
+def fake(tmp_path):
+    tickers = FakeTickers()
+    tickers.cache = lambda: FundamentalsCache(root=str(tmp_path), ticker_factory=tickers)
+    return tickers
+
+
+def test_fresh_entry_is_served_from_disk_after_a_restart(fake):
+    first = fake.cache().get("nvda", "financials")
+    second = fake.cache().get("NVDA", "financials")
+    pd.testing.assert_frame_equal(first, second)
+    assert fake.fetches["financials"] == 1
+
+
+def test_statements_expire_at_the_next_earnings_date(fake, monkeypatch):
+    now = time.time()
+    earnings = now + 3600
+    fake.values["calendar"] = {"Earnings Date": [pd.Timestamp(earnings, unit="s").isoformat()]}
+    cache = fake.cache()
+    cache.get("NVDA", "financials")
+    assert cache.load_meta("NVDA")["financials"]["expires_at"] == pytest.approx(earnings + EARNINGS_GRACE, abs=1)
+
+    monkeypatch.setattr(fc.time, "time", lambda: earnings + EARNINGS_GRACE - 60)
+    fake.cache().get("NVDA", "financials")
+    assert fake.fetches["financials"] == 1
+
+    monkeypatch.setattr(fc.time, "time", lambda: earnings + EARNINGS_GRACE + 60)
+    fake.cache().get("NVDA", "financials")
+    assert fake.fetches["financials"] == 2
+
+
+@pytest.mark.parametrize("failure", [OSError("Yahoo unavailable"), pd.DataFrame()])
+def test_failed_or_empty_refresh_returns_the_stale_copy(fake, failure):
+    stored = fake.cache().get("NVDA", "financials")
+
+    fake.values["financials"] = failure
+    cache = fake.cache()
+    cache.invalidate("NVDA")
+    pd.testing.assert_frame_equal(cache.get("NVDA", "financials"), stored)
+    assert fake.fetches["financials"] == 2
+    # The stale copy stays on disk for the next attempt
+    assert cache.load_meta("NVDA")["financials"]["expires_at"] == 0
@@ -0,0 +1,71 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from utils import googlenews_utils
+from utils.rate_limit import RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def google(monkeypatch):
+    """Fake Google: records each page sent and serves `pages` result pages of 10 results."""
+    state = SimpleNamespace(sent=[], prefetched=[], pages=1)
+
+    def send(url, headers):
+        offset = int(url.rsplit("start=", 1)[1])
+        state.sent.append(offset)
+        if threading.current_thread() is not threading.main_thread():
+            state.prefetched.append(offset)
+        return SimpleNamespace(status_code=200, headers={}, content=offset)
+
+    def parse(offset):
+        page = offset // 10
+        if page >= state.pages:
+            return [], False, False
+        return [{"title": f"{page}-{i}"} for i in range(10)], True, page + 1 < state.pages
+
+    monkeypatch.setattr(googlenews_utils, "_send_request", send)
+    monkeypatch.setattr(googlenews_utils, "parse_news_page", parse)
+
+    def limit(burst):
+        limiter = RateLimiter()
+        limiter.configure(googlenews_utils.GOOGLE_HOST, rate=0.001, capacity=burst)
+        monkeypatch.setattr(googlenews_utils, "rate_limiter", limiter)
+
+    state.limit = limit
+    return state
+
+
+def test_next_page_is_prefetched_when_a_token_is_spare(google):
+    google.pages = 3
+    google.limit(burst=4)
+    results = googlenews_utils.getNewsData("bitcoin", "2025-08-01", "2025-08-02", max_results=20)
+    assert len(results) == 20
+    assert sorted(google.sent) == [0, 10]
+    assert google.prefetched == [10]
+
+
+def test_no_prefetch_without_a_spare_token(google):
+    google.limit(burst=1)
+    results = googlenews_utils.getNewsData("bitcoin", "2025-08-01", "2025-08-02", max_results=20)
+    assert len(results) == 10
+    assert google.sent == [0]
+
+
+def test_abandoned_prefetch_is_not_sent(google):
+    google.limit(burst=4)
+    abandoned = threading.Event()
+    abandoned.set()
+    url = "https://www.google.com/search?q=x&tbm=nws&start=10"
+    assert googlenews_utils._prefetch_request(url, {}, abandoned) is None
+    assert google.sent == []
+
+
+def test_try_acquire_never_waits():
+    bucket = TokenBucket(rate=0.001, capacity=1)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    bucket.tokens = 5
+    bucket.block(60)
+    assert not bucket.try_acquire()
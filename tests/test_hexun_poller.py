@@ -0,0 +1,50 @@
+from utils.hexun_poller import HexunPoller
+
+
+class FakePages:
+    """Serves one list of (title, url) pairs per poll, as extract_items would find them."""
+
+    def __init__(self, *polls):
+        self.polls = list(polls)
+
+    def __call__(self, url):
+        items = self.polls.pop(0) if len(self.polls) > 1 else self.polls[0]
+        return "<div class='temp01'><ul>" + "".join(
+            f"<li><a href='{href}'>{title}</a></li>" for title, href in items
+        ) + "</ul></div>"
+
+
+def poller(*polls, **kwargs):
+    return HexunPoller(pages=["https://futures.hexun.com/"], fetcher=FakePages(*polls), **kwargs)
+
+
+def test_listing_returns_current_page_only():
+    hexun = poller(
+        [("原油期货上涨", "/a"), ("黄金价格回落", "/b")],
+        [("PTA 库存下降", "/c"), ("原油期货上涨", "/a")],
+    )
+    hexun.poll_once()
+    hexun.poll_once()
+    assert hexun.listing(refresh=False) == ["PTA 库存下降", "原油期货上涨"]
+    assert hexun.listing("pta", refresh=False) == ["PTA 库存下降"]
+    assert hexun.listing(limit=1, refresh=False) == ["PTA 库存下降"]
+
+
+def test_search_covers_retained_history_newest_first():
+    hexun = poller(
+        [("原油期货上涨", "/a"), ("黄金价格回落", "/b")],
+        [("原油库存增加", "/c")],
+    )
+    hexun.poll_once()
+    hexun.poll_once()
+    assert hexun.search("原油", refresh=False) == ["原油库存增加", "原油期货上涨"]
+    assert hexun.search(refresh=False, limit=2) == ["原油库存增加", "原油期货上涨"]
+    assert hexun.listing(refresh=False) == ["原油库存增加"]
+
+
+def test_failed_poll_keeps_previous_listing():
+    hexun = poller([("原油期货上涨", "/a")])
+    hexun.poll_once()
+    hexun.fetcher = lambda url: (_ for _ in ()).throw(OSError("timed out"))
+    hexun.poll_once()
+    assert hexun.listing(refresh=False) == ["原油期货上涨"]
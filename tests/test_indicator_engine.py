@@ -0,0 +1,98 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from stockstats import wrap
+
+from utils.indicator_engine import IndicatorEngine
+from utils.price_store import PriceStore
+
+INDICATORS = [
+    "close_5_sma", "close_50_sma", "close_10_ema",
+    "macd", "macds", "macdh", "rsi", "atr",
+    "boll", "boll_ub", "boll_lb", "vwma", "mfi",
+]
+
+
+def price_frame(closes):
+    closes = np.asarray(closes, dtype=float)
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2020-01-01", periods=len(closes)),
+        "Open": closes,
+        "High": closes + rng.uniform(0, 2, len(closes)),
+        "Low": closes - rng.uniform(0, 2, len(closes)),
+        "Close": closes,
+        "Volume": rng.integers(1_000, 10_000, len(closes)).astype(float),
+    })
+
+
+def stockstats_values(data, indicator):
+    return wrap(data.copy())[indicator].to_numpy(dtype=float)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return IndicatorEngine(PriceStore(str(tmp_path)))
+
+
+def test_matches_stockstats_on_clean_data(engine):
+    rng = np.random.default_rng(0)
+    data = price_frame(100 + np.cumsum(rng.normal(0, 1, 400)))
+    engine.store.write("AAA", data)
+    frame = engine.frame("AAA", INDICATORS)
+    for indicator in INDICATORS:
+        np.testing.assert_allclose(
+            frame[indicator].to_numpy(), stockstats_values(data, indicator),
+            rtol=1e-9, atol=1e-9, err_msg=indicator,
+        )
+
+
+def test_incremental_append_matches_full_rebuild(engine):
+    rng = np.random.default_rng(2)
+    data = price_frame(50 + np.cumsum(rng.normal(0, 1, 300)))
+    engine.store.write("AAA", data.iloc[:250])
+    engine.frame("AAA", INDICATORS)
+    engine.store.append("AAA", data.iloc[250:])
+    frame = engine.frame("AAA", INDICATORS)
+    for indicator in INDICATORS:
+        np.testing.assert_allclose(
+            frame[indicator].to_numpy(), stockstats_values(data, indicator),
+            rtol=1e-9, atol=1e-9, err_msg=indicator,
+        )
+
+
+def test_nan_bar_does_not_poison_state(engine):
+    data = price_frame([1, 2, np.nan] + [3] * 20)
+    engine.store.write("AAA", data)
+    sma = engine.series("AAA", "close_5_sma").to_numpy()
+    expected = stockstats_values(data, "close_5_sma")
+    np.testing.assert_allclose(sma, expected, rtol=1e-12)
+    assert np.isfinite(sma[3:]).all()
+    assert sma[-1] == pytest.approx(3.0)
+
+    with open(os.path.join(engine.store.root, "AAA", "indicators", "close_5_sma.json")) as f:
+        state = json.load(f)["state"]["window"]
+    assert np.isfinite(state["total"]) and np.isfinite(state["total_sq"])
+
+    for indicator in ("close_10_ema", "macd", "boll", "rsi", "atr", "vwma", "mfi"):
+        assert np.isfinite(engine.series("AAA", indicator).to_numpy()[-5:]).all(), indicator
+
+
+def test_ewm_gap_matches_stockstats(engine):
+    data = price_frame([10, 11, np.nan, 12, 13, 12, 14, 15])
+    engine.store.write("AAA", data)
+    frame = engine.frame("AAA", ["close_5_ema", "macd"])
+    for indicator in ("close_5_ema", "macd"):
+        np.testing.assert_allclose(
+            frame[indicator].to_numpy(), stockstats_values(data, indicator), rtol=1e-12, err_msg=indicator
+        )
+
+
+def test_sibling_outputs_share_one_state(engine):
+    engine.store.write("AAA", price_frame(np.linspace(10, 20, 60)))
+    engine.frame("AAA", ["macd", "macds", "macdh", "boll", "boll_ub", "boll_lb"])
+    files = sorted(os.listdir(os.path.join(engine.store.root, "AAA", "indicators")))
+    assert files == ["boll.f8", "boll.json", "macd.f8", "macd.json"]
@@ -0,0 +1,23 @@
+from utils.news_format import compact_news
+
+
+def entry(title, summary="", link="", source="https://a.com/rss"):
+    return {"title": title, "summary": summary, "link": link, "source": source,
+            "published": "Mon, 25 Aug 2025 10:00:00 GMT"}
+
+
+def test_links_are_kept_by_default():
+    text = compact_news([entry("Bitcoin tops $100k", link="https://a.com/btc")], "btc")
+    assert text.splitlines()[2].endswith("|link")
+    assert text.splitlines()[-1].endswith("|https://a.com/btc")
+
+
+def test_long_entry_is_skipped_not_the_rest():
+    entries = [
+        entry("Bitcoin and BTC XBT " + "rally " * 200, "Bitcoin " * 200),
+        entry("Dogecoin dips", "BTC falls 2%"),
+    ]
+    text = compact_news(entries, "btc", token_budget=100, max_summary_chars=2000)
+    lines = text.splitlines()
+    assert lines[0].startswith("# news for BTC: 1 of 2 entries")
+    assert "Dogecoin dips" in lines[-1]
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.price_cache import PriceCache
+from utils.price_store import PriceStore
+
+
+class FakeDownloader:
+    """Single-symbol downloader returning business-day bars and recording each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, start_date, end_date):
+        self.calls.append((symbol, start_date, end_date))
+        dates = pd.bdate_range(start_date, pd.Timestamp(end_date) - pd.Timedelta(days=1), name="Date")
+        return pd.DataFrame({
+            "Open": 100.0, "High": 101.0, "Low": 99.0, "Close": 100.5,
+            "Volume": np.full(len(dates), 1000),
+        }, index=dates).reset_index()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PriceCache(PriceStore(str(tmp_path / "store")), data_dir=str(tmp_path / "legacy"), downloader=FakeDownloader())
+
+
+def test_symbol_case_shares_one_dataset(cache):
+    assert cache.refresh("NVDA", today="2024-06-03") == "NVDA"
+    assert cache.refresh("nvda", today="2024-06-03") == "NVDA"
+    assert len(cache.downloader.calls) == 1
+    assert list(cache.load_manifest()) == ["NVDA"]
+
+
+def test_up_to_date_refresh_does_not_rewrite_the_manifest(cache):
+    cache.refresh("NVDA", today="2024-06-03")
+    written = os.stat(cache.manifest_path).st_mtime_ns
+    os.utime(cache.manifest_path, ns=(written - 10**9, written - 10**9))
+
+    cache.refresh("NVDA", today="2024-06-03")
+    cache.refresh_many(["NVDA"], today="2024-06-03")
+    assert os.stat(cache.manifest_path).st_mtime_ns == written - 10**9
+
+    cache.refresh("NVDA", today="2024-06-05")
+    assert cache.load_manifest()["NVDA"]["covered_until"] == "2024-06-05"
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import interface, yfin_utils
+from utils.price_cache import PriceCache
+from utils.price_store import PriceStore
+
+
+class FakeBatchDownloader:
+    """Frames shaped like download_prices_many: yf.download column order, float volume."""
+
+    def __init__(self, listed_from=None):
+        self.calls = []
+        self.listed_from = listed_from or {}
+
+    def __call__(self, symbols, start_date, end_date):
+        self.calls.append((tuple(symbols), start_date, end_date))
+        frames = {}
+        for symbol in symbols:
+            if symbol == "BAD":
+                frames[symbol] = pd.DataFrame(columns=["Date"])
+                continue
+            first = max(pd.Timestamp(start_date), pd.Timestamp(self.listed_from.get(symbol, "1990-01-01")))
+            dates = pd.bdate_range(first, pd.Timestamp(end_date) - pd.Timedelta(days=1), name="Date")
+            base = 100.0 + (dates - pd.Timestamp("2000-01-01")).days / 7.0
+            frames[symbol] = pd.DataFrame({
+                "Close": base + 0.123, "High": base + 1.456, "Low": base - 1.789, "Open": base,
+                "Volume": np.full(len(dates), 1_000_000.0),
+            }, index=dates).reset_index()
+        return frames
+
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    fake = FakeBatchDownloader(listed_from={"NEW": "2024-06-03"})
+    cache = PriceCache(PriceStore(str(tmp_path / "store")), data_dir=str(tmp_path / "legacy"), batch_downloader=fake)
+    monkeypatch.setattr(yfin_utils, "price_cache", cache)
+    monkeypatch.setattr(yfin_utils, "price_store", cache.store)
+    return fake
+
+
+def test_batch_report_matches_single_symbol_layout(downloader):
+    reports = interface.get_YFin_data_online_batch(["aapl", "MSFT", "BAD"], "2024-02-05", "2024-02-10")
+    assert len(downloader.calls) == 1
+
+    lines = reports["aapl"].splitlines()
+    assert lines[0] == "# Stock data for AAPL from 2024-02-05 to 2024-02-10"
+    assert lines[1] == "# Total records: 5"
+    assert lines[4] == "Date,Open,High,Low,Close,Volume"
+    date, *values = lines[5].split(",")
+    assert date == "2024-02-05"
+    assert values[-1] == "1000000"
+    assert all(len(v.split(".")[1]) <= 2 for v in values[:4])
+    assert reports["BAD"] == "No data found for symbol 'BAD' between 2024-02-05 and 2024-02-10"
+
+
+def test_second_batch_makes_no_request(downloader):
+    interface.get_YFin_data_online_batch(["AAPL", "MSFT"], "2024-02-05", "2024-02-10")
+    interface.get_YFin_data_online_batch(["AAPL", "MSFT"], "2024-03-01", "2024-03-08")
+    assert len(downloader.calls) == 1
+
+
+def test_start_before_history_window_is_fetched(downloader):
+    frames = yfin_utils.get_stock_data_batch(["AAPL"], "2005-01-03", "2005-01-07")
+    assert downloader.calls[0][1] == "2005-01-03"
+    assert list(frames["AAPL"]["Date"].dt.strftime("%Y-%m-%d")) == [
+        "2005-01-03", "2005-01-04", "2005-01-05", "2005-01-06", "2005-01-07",
+    ]
+
+    # A stored symbol fetched from a later date is downloaded again from the earlier one
+    yfin_utils.get_stock_data_batch(["MSFT"], "2020-01-02", "2020-01-03")
+    frames = yfin_utils.get_stock_data_batch(["MSFT"], "2003-01-02", "2003-01-03")
+    assert downloader.calls[-1] == (("MSFT",), "2003-01-02", downloader.calls[-1][2])
+    assert len(frames["MSFT"]) == 2
+
+
+def test_symbol_listed_after_start_is_not_refetched(downloader):
+    yfin_utils.get_stock_data_batch(["NEW"], "2003-01-02", "2024-06-07")
+    calls = len(downloader.calls)
+    frames = yfin_utils.get_stock_data_batch(["NEW"], "2003-01-02", "2024-06-07")
+    assert len(downloader.calls) == calls
+    assert frames["NEW"]["Date"].iloc[0] == pd.Timestamp("2024-06-03")
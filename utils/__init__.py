@@ -7,11 +7,14 @@ from .yfin_utils import YFinanceUtils
 from .interface import (
     # News and sentiment functions
     get_google_news,
+    get_google_news_many,
     get_reddit_global_news,
     get_reddit_company_news,
+    get_reddit_company_news_batch,
     # Financial statements functions
     # Technical analysis functions
     get_stock_stats_indicators_window,
+    get_stock_stats_indicators_batch,
     get_stockstats_indicator,
     # Market data functions
     get_YFin_data_window,
@@ -21,14 +24,17 @@ from .interface import (
 __all__ = [
     # News and sentiment functions
     "get_google_news",
+    "get_google_news_many",
     "get_reddit_global_news",
     "get_reddit_company_news",
+    "get_reddit_company_news_batch",
     # Financial statements functions
     "get_simfin_balance_sheet",
     "get_simfin_cashflow",
     "get_simfin_income_statements",
     # Technical analysis functions
     "get_stock_stats_indicators_window",
+    "get_stock_stats_indicators_batch",
     "get_stockstats_indicator",
     # Market data functions
     "get_YFin_data_window",
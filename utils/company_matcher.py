@@ -0,0 +1,75 @@
+import re
+from typing import Annotated, Dict, List, Optional
+
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def _is_literal(alias: str) -> bool:
+    return alias.isascii() and not _REGEX_METACHARS.intersection(alias)
+
+
+class CompanyMatcher:
+    """
+    Case-insensitive "does this post mention the company" test for one or
+    more tickers, compiled once.
+
+    Aliases are regular expressions (as they always were in the company
+    filter). Aliases without regex syntax are tested as lowercase substrings
+    when the text is ASCII, where that is exactly what IGNORECASE matching
+    does; everything else goes through one compiled pattern per ticker.
+    """
+
+    def __init__(
+        self,
+        aliases_by_ticker: Annotated[Dict[str, List[str]], "ticker -> alias patterns"],
+    ):
+        self.tickers = list(aliases_by_ticker)
+        self.literals: Dict[str, List[str]] = {}
+        self.patterns: Dict[str, re.Pattern] = {}
+        self.regex_only: Dict[str, Optional[re.Pattern]] = {}
+        for ticker, aliases in aliases_by_ticker.items():
+            self.patterns[ticker] = re.compile(
+                "|".join(f"(?:{alias})" for alias in aliases), re.IGNORECASE
+            )
+            literals = [a for a in aliases if _is_literal(a)]
+            regexes = [a for a in aliases if not _is_literal(a)]
+            self.literals[ticker] = [a.lower() for a in literals]
+            self.regex_only[ticker] = (
+                re.compile("|".join(f"(?:{a})" for a in regexes), re.IGNORECASE)
+                if regexes
+                else None
+            )
+
+    def _matches(self, ticker: str, text: str, lowered: Optional[str]) -> bool:
+        if lowered is None:
+            return self.patterns[ticker].search(text) is not None
+        if any(alias in lowered for alias in self.literals[ticker]):
+            return True
+        pattern = self.regex_only[ticker]
+        return pattern is not None and pattern.search(text) is not None
+
+    def match(self, *texts: str) -> List[str]:
+        """Tickers (in matcher order) mentioned in any of the texts."""
+        found = set()
+        remaining = self.tickers
+        for text in texts:
+            if not remaining:
+                break
+            lowered = text.lower() if text.isascii() else None
+            still = []
+            for ticker in remaining:
+                if self._matches(ticker, text, lowered):
+                    found.add(ticker)
+                else:
+                    still.append(ticker)
+            remaining = still
+        return [ticker for ticker in self.tickers if ticker in found]
+
+    def mentions(self, ticker: str, *texts: str) -> bool:
+        """Whether any of the texts mentions the ticker's company."""
+        for text in texts:
+            lowered = text.lower() if text.isascii() else None
+            if self._matches(ticker, text, lowered):
+                return True
+        return False
+
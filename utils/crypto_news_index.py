@@ -0,0 +1,107 @@
+import re
+from typing import Dict, List, Any, Hashable, Set, Tuple
+
+# Aliases per ticker, in the same "A OR B" form as reddit_utils.ticker_to_company.
+# Tickers that are also common English words (LINK, DOT, NEAR, ...) are only
+# matched by their project name.
+crypto_ticker_to_name = {
+    "BTC": "Bitcoin OR BTC OR XBT",
+    "ETH": "Ethereum OR Ether OR ETH",
+    "SOL": "Solana OR SOL",
+    "XRP": "XRP OR Ripple",
+    "BNB": "BNB OR Binance Coin",
+    "ADA": "Cardano OR ADA",
+    "DOGE": "Dogecoin OR DOGE",
+    "TRX": "Tron OR TRX",
+    "TON": "Toncoin",
+    "AVAX": "Avalanche OR AVAX",
+    "DOT": "Polkadot",
+    "LINK": "Chainlink",
+    "MATIC": "Polygon OR MATIC OR POL",
+    "LTC": "Litecoin OR LTC",
+    "BCH": "Bitcoin Cash OR BCH",
+    "SHIB": "Shiba Inu OR SHIB",
+    "XLM": "Stellar OR XLM",
+    "ATOM": "Cosmos",
+    "UNI": "Uniswap",
+    "XMR": "Monero OR XMR",
+    "ETC": "Ethereum Classic OR ETC",
+    "APT": "Aptos",
+    "ARB": "Arbitrum OR ARB",
+    "OP": "Optimism",
+    "SUI": "Sui OR SUI",
+    "NEAR": "NEAR Protocol",
+    "PEPE": "Pepe OR PEPE",
+    "USDT": "Tether OR USDT",
+    "USDC": "USD Coin OR USDC",
+}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens with HTML tags removed ("$ETH" -> "eth")."""
+    return _TOKEN_RE.findall(_TAG_RE.sub(" ", text).lower())
+
+
+def ticker_aliases(ticker: str) -> List[str]:
+    names = crypto_ticker_to_name.get(ticker.upper())
+    if not names:
+        return [ticker]
+    return names.split(" OR ")
+
+
+class CryptoNewsIndex:
+    """
+    Positional inverted index from title/summary token to article id.
+    Articles are added incrementally; adding a known id is a no-op. A ticker
+    lookup is the union over its aliases, where a multi-word alias
+    ("Bitcoin Cash") matches articles containing its tokens as a phrase.
+    """
+
+    def __init__(self):
+        # token -> {article id: positions of the token in the article}
+        self.postings: Dict[str, Dict[Hashable, Tuple[int, ...]]] = {}
+        self.ids: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, article_id: Hashable, entry: Dict[str, Any]):
+        if article_id in self.ids:
+            return
+        self.ids.add(article_id)
+        title = tokenize(entry.get("title", ""))
+        # The gap keeps a phrase from running from the title into the summary
+        tokens = title + [""] + tokenize(entry.get("summary", ""))
+        positions: Dict[str, List[int]] = {}
+        for position, token in enumerate(tokens):
+            if token:
+                positions.setdefault(token, []).append(position)
+        for token, where in positions.items():
+            self.postings.setdefault(token, {})[article_id] = tuple(where)
+
+    def _phrase(self, tokens: List[str]) -> Set[Hashable]:
+        postings = [self.postings.get(t, {}) for t in tokens]
+        smallest = min(postings, key=len)
+        candidates = set(smallest).intersection(*postings)
+        if len(tokens) == 1:
+            return candidates
+        matches = set()
+        for article_id in candidates:
+            following = [set(p[article_id]) for p in postings[1:]]
+            if any(
+                all(start + i in where for i, where in enumerate(following, 1))
+                for start in postings[0][article_id]
+            ):
+                matches.add(article_id)
+        return matches
+
+    def lookup(self, ticker: str) -> Set[Hashable]:
+        matches: Set[Hashable] = set()
+        for alias in ticker_aliases(ticker):
+            tokens = tokenize(alias)
+            if tokens:
+                matches |= self._phrase(tokens)
+        return matches
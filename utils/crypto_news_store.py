@@ -0,0 +1,195 @@
+import bisect
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from .crypto_news_index import CryptoNewsIndex
+from .crypto_rss_utils import CRYPTO_RSS_FEEDS, fetch_feeds
+
+NEWS_STORE_PATH = os.path.join(os.getenv("DATA_DIR") or "data_cache", "crypto_news", "articles.jsonl")
+
+# Query parameters that only identify the referrer, not the article.
+TRACKING_PARAMS = {"ref", "source", "fbclid", "gclid"}
+TRACKING_PREFIX = "utm_"
+# Content hashes only suppress copies ingested within this many seconds, so
+# a recurring headline with new content is stored again later.
+HASH_WINDOW = float(os.getenv("CRYPTO_NEWS_HASH_WINDOW", str(3 * 86400)))
+
+
+def normalize_link(link: str) -> str:
+    """Canonical form of an article URL so the same story matches across feeds."""
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIX)
+    ]
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{urlencode(query)}" if query else f"{host}{path}"
+
+
+def _normalize_text(text: str) -> str:
+    text = re.sub(r"<[^>]+>", " ", text or "")
+    return re.sub(r"[^0-9a-z]+", " ", text.lower()).strip()
+
+
+def content_hash(entry: Dict[str, Any]) -> Optional[str]:
+    """
+    Hash of the normalized title and summary; syndicated copies keep both but
+    change the link. None for entries without a real title.
+    """
+    title = _normalize_text(entry.get("title", ""))
+    if not title or title == "no title":
+        return None
+    summary = _normalize_text(entry.get("summary", ""))
+    return hashlib.sha1(f"{title}\n{summary}".encode("utf-8")).hexdigest()
+
+
+def article_key(entry: Dict[str, Any]) -> str:
+    link = entry.get("link", "")
+    if link and link != "No link":
+        return normalize_link(link)
+    return entry.get("guid", "") or content_hash(entry)
+
+
+class CryptoNewsStore:
+    """
+    Append-only JSONL store of crypto news articles.
+    Every new article gets a monotonically increasing `seq`, which doubles as
+    the cursor for get_since(). Articles are deduplicated by link/GUID key and
+    by a title + summary hash, so syndicated copies from other feeds ingested
+    within `hash_window` seconds are dropped.
+    """
+
+    def __init__(self, path: str = NEWS_STORE_PATH, hash_window: float = HASH_WINDOW):
+        self.path = path
+        self.hash_window = hash_window
+        self.articles: List[Dict[str, Any]] = []
+        self.seqs: List[int] = []
+        self.keys = set()
+        # content hash -> when it was last ingested
+        self.hashes: Dict[str, float] = {}
+        self.index = CryptoNewsIndex()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        valid_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    valid_end = f.tell()
+                if not line.strip():
+                    continue
+                try:
+                    article = json.loads(line)
+                except ValueError:
+                    # Partial line left by an interrupted append
+                    continue
+                self._remember(article)
+        if valid_end < os.path.getsize(self.path):
+            # Drop an unterminated tail so the next append starts on a fresh line
+            os.truncate(self.path, valid_end)
+
+    def _remember(self, article: Dict[str, Any]):
+        self.articles.append(article)
+        self.seqs.append(article["seq"])
+        self.keys.add(article["key"])
+        if article.get("hash"):
+            self.hashes[article["hash"]] = article["ingested_at"]
+        self.index.add(article["seq"], article)
+
+    def _seen_content(self, digest: Optional[str], now: float) -> bool:
+        if digest is None:
+            return False
+        seen_at = self.hashes.get(digest)
+        if seen_at is None:
+            return False
+        if now - seen_at > self.hash_window:
+            del self.hashes[digest]
+            return False
+        return True
+
+    @property
+    def last_seq(self) -> int:
+        return self.articles[-1]["seq"] if self.articles else 0
+
+    def ingest(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Append entries not seen before and return the newly stored articles."""
+        added = []
+        with self._lock:
+            now = time.time()
+            for entry in entries:
+                key = article_key(entry)
+                digest = content_hash(entry)
+                if key in self.keys or self._seen_content(digest, now):
+                    continue
+                article = dict(entry)
+                article.update({
+                    "seq": self.last_seq + 1,
+                    "key": key,
+                    "hash": digest,
+                    "ingested_at": now,
+                })
+                self._remember(article)
+                added.append(article)
+
+            if added:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for article in added:
+                        f.write(json.dumps(article, ensure_ascii=False) + "\n")
+        return added
+
+    def get_since(self, cursor: int = 0, ticker: str = "") -> Tuple[List[Dict[str, Any]], int]:
+        """Return articles stored after `cursor` (optionally filtered by ticker) and the new cursor."""
+        # seq increases along the list (with gaps only where a line was unreadable)
+        start = bisect.bisect_right(self.seqs, cursor)
+        if ticker:
+            seqs = sorted(seq for seq in self.index.lookup(ticker) if seq > cursor)
+            articles = [self.articles[bisect.bisect_left(self.seqs, seq, start)] for seq in seqs]
+        else:
+            articles = self.articles[start:]
+        return articles, self.last_seq
+
+
+_store: Optional[CryptoNewsStore] = None
+
+
+def get_news_store() -> CryptoNewsStore:
+    global _store
+    if _store is None:
+        _store = CryptoNewsStore()
+    return _store
+
+
+def ingest_crypto_rss_feeds(feed_urls: List[str] = CRYPTO_RSS_FEEDS) -> int:
+    """Fetch all feeds and append unseen articles to the store; returns how many were added."""
+    store = get_news_store()
+    added = 0
+    for feed_url, entries in fetch_feeds(feed_urls).items():
+        added += len(store.ingest([dict(entry, source=feed_url) for entry in entries]))
+    return added
+
+
+def get_crypto_news_since(cursor: int = 0, ticker: str = "") -> str:
+    """
+    Refresh the store from the RSS feeds and return only articles newer than `cursor`.
+    The response carries the cursor to pass on the next call.
+    """
+    ingest_crypto_rss_feeds()
+    articles, next_cursor = get_news_store().get_since(cursor, ticker)
+    entries = [
+        {k: article.get(k) for k in ("title", "link", "published", "summary", "source")}
+        for article in articles
+    ]
+    return json.dumps({"cursor": next_cursor, "entries": entries}, indent=2, ensure_ascii=False)
@@ -1,53 +1,268 @@
+import asyncio
 import feedparser
+import hashlib
 import json
-from typing import Dict, List, Any
+import os
+import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
 
+from .crypto_news_index import CryptoNewsIndex
+from .http_client import get_http_client
+from .news_format import compact_news, DEFAULT_TOKEN_BUDGET
+
+CRYPTO_RSS_FEEDS = [
+    "https://cointelegraph.com/rss",
+    "https://bitcoinist.com/feed/",
+    "https://bitcoinethereumnews.com/feed/",
+    "https://cryptoverze.com/feed/",
+    "https://www.coolwallet.io/blogs/blog.atom",
+    "https://latinoreview.com/feed/",
+    "https://bitrss.com/rss.xml",
+    "https://coinlabz.com/feed/",
+    "https://crypto.news/feed/",
+    "https://cryptobriefing.com/feed/",
+    "https://99bitcoins.com/feed/",
+    "https://cryptopotato.com/feed/",
+    "https://www.newsbtc.com/feed/",
+]
+
+# Fan-out limits: at most MAX_CONCURRENCY feeds in flight, FEED_TIMEOUT seconds
+# per feed and FETCH_DEADLINE seconds for the whole batch. Both bound the HTTP
+# request itself, so a feed given up on also releases its pool worker.
+MAX_CONCURRENCY = 16
+FEED_TIMEOUT = 10.0
+FETCH_DEADLINE = 15.0
+# Bytes read per chunk while checking a download against its time limit
+READ_CHUNK_SIZE = 64 * 1024
+
+# Parsed feeds are cached per URL together with their ETag/Last-Modified
+# validators; entries younger than FEED_CACHE_TTL seconds are served without
+# touching the network, older ones are revalidated with a conditional GET.
+FEED_CACHE_DIR = os.path.join(os.getenv("DATA_DIR") or "data_cache", "rss_cache")
+FEED_CACHE_TTL = float(os.getenv("RSS_FEED_CACHE_TTL", "300"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Module-level pool so abandoned fetches never block asyncio.run() shutdown.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="rss")
+    return _executor
+
+
+def parse_feed_entries(content: bytes, max_entries: int = 999) -> List[Dict[str, Any]]:
+    feed = feedparser.parse(content)
+    if not feed.entries:
+        return []
+
+    entries: List[Dict[str, Any]] = []
+    for entry in feed.entries[:max_entries]:
+        entry_info = {
+            'title': entry.get('title', 'No title'),
+            'link': entry.get('link', 'No link'),
+            'published': entry.get('published', 'No date'),
+            'summary': entry.get('summary', 'No summary'),
+            'guid': entry.get('id', ''),
+        }
+        entries.append(entry_info)
+
+    return entries
+
+
+def _feed_cache_path(feed_url: str) -> str:
+    digest = hashlib.sha1(feed_url.encode("utf-8")).hexdigest()
+    return os.path.join(FEED_CACHE_DIR, f"{digest}.json")
+
+
+def load_cached_feed(feed_url: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_feed_cache_path(feed_url), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_feed(feed_url: str, record: Dict[str, Any]) -> None:
+    os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+    path = _feed_cache_path(feed_url)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read_body(response: requests.Response, expires_at: float) -> bytes:
+    # requests' timeout applies to each socket read, so a feed that trickles
+    # bytes could run on indefinitely; the whole body must arrive by expires_at.
+    read1 = getattr(response.raw, "read1", None)
+    if read1 is None:  # urllib3 < 2: reads block until a whole chunk arrives
+        pieces = response.iter_content(READ_CHUNK_SIZE)
+    else:
+        pieces = iter(lambda: read1(READ_CHUNK_SIZE, decode_content=True), b"")
+    chunks = []
+    for chunk in pieces:
+        chunks.append(chunk)
+        if time.monotonic() > expires_at:
+            response.close()
+            raise requests.exceptions.Timeout(f"{response.url} took longer than its time limit")
+    return b"".join(chunks)
+
+
+def extract_feed_entries(
+    feed_url: str,
+    max_entries: int = 999,
+    timeout: float = FEED_TIMEOUT,
+    ttl: float = FEED_CACHE_TTL,
+    deadline_at: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Entries of one feed, from the cache or the network. The request is given
+    `timeout` seconds in total, cut short at `deadline_at` (a time.monotonic()
+    value) if that comes first; on failure the cached entries are returned.
+    """
+    cached = load_cached_feed(feed_url)
+    if cached and time.time() - cached["fetched_at"] < ttl:
+        return cached["entries"][:max_entries]
+
+    expires_at = time.monotonic() + timeout
+    if deadline_at is not None:
+        expires_at = min(expires_at, deadline_at)
+    remaining = expires_at - time.monotonic()
+    if remaining <= 0:
+        # Queued past the batch deadline: nobody is waiting for this feed any more
+        return cached["entries"][:max_entries] if cached else []
+
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
 
-def extract_feed_entries(feed_url: str, max_entries: int = 999) -> List[Dict[str, Any]]:
     try:
-        feed = feedparser.parse(feed_url)
-        if not feed.entries:
-            return []
-
-        entries: List[Dict[str, Any]] = []
-        for entry in feed.entries[:max_entries]:
-            entry_info = {
-                'title': entry.get('title', 'No title'),
-                'link': entry.get('link', 'No link'),
-                'published': entry.get('published', 'No date'),
-                'summary': entry.get('summary', 'No summary'),
-            }
-            entries.append(entry_info)
-
-        return entries
+        # No retries: a slow feed must not outlive its timeout / the batch deadline
+        response = get_http_client().get(
+            feed_url, headers=headers, timeout=remaining, retries=0, stream=True
+        )
+        if response.status_code == 304 and cached:
+            # Unchanged upstream: refresh the timestamp, skip parsing entirely.
+            response.close()
+            cached["fetched_at"] = time.time()
+            store_cached_feed(feed_url, cached)
+            return cached["entries"][:max_entries]
+        if response.status_code != 200:
+            response.close()
+            return cached["entries"][:max_entries] if cached else []
+
+        entries = parse_feed_entries(_read_body(response, expires_at))
+        store_cached_feed(feed_url, {
+            "url": feed_url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "entries": entries,
+        })
+        return entries[:max_entries]
     except Exception:
-        return []
+        return cached["entries"][:max_entries] if cached else []
+
+
+async def fetch_feeds_async(
+    feed_urls: List[str],
+    max_entries: int = 999,
+    max_concurrency: int = MAX_CONCURRENCY,
+    feed_timeout: float = FEED_TIMEOUT,
+    deadline: float = FETCH_DEADLINE,
+    ttl: float = FEED_CACHE_TTL,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch all feeds concurrently over the shared session.
+    Feeds that fail, exceed feed_timeout, or are still pending when the
+    deadline expires are returned with no entries. Their requests carry the
+    same limits, so the pool workers running them are freed by then as well.
+    Fresh cached feeds are served without a request (see extract_feed_entries).
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    deadline_at = time.monotonic() + deadline
+
+    async def fetch_one(feed_url: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await asyncio.wait_for(
+                loop.run_in_executor(
+                    _get_executor(), extract_feed_entries,
+                    feed_url, max_entries, feed_timeout, ttl, deadline_at,
+                ),
+                timeout=feed_timeout,
+            )
+
+    tasks = {feed_url: asyncio.ensure_future(fetch_one(feed_url)) for feed_url in feed_urls}
+    if not tasks:
+        return {}
+    await asyncio.wait(tasks.values(), timeout=deadline)
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for feed_url, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            results[feed_url] = []
+        elif task.cancelled() or task.exception() is not None:
+            results[feed_url] = []
+        else:
+            results[feed_url] = task.result()
+    return results
+
+
+def fetch_feeds(feed_urls: List[str], **kwargs) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Blocking wrapper around fetch_feeds_async. Inside a running event loop it
+    would stall that loop for up to the deadline, so it raises there instead;
+    await fetch_feeds_async (or crypto_rss_feeds_async) from coroutines.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(fetch_feeds_async(feed_urls, **kwargs))
+    raise RuntimeError(
+        "fetch_feeds() blocks and cannot be called from a running event loop; "
+        "use 'await fetch_feeds_async(...)' instead"
+    )
+
+
+def crypto_rss_feeds(
+    ticker: str = "btc", compact: bool = False, token_budget: int = DEFAULT_TOKEN_BUDGET
+) -> str:
+    return _format_feeds(fetch_feeds(CRYPTO_RSS_FEEDS), ticker, compact, token_budget)
+
+
+async def crypto_rss_feeds_async(
+    ticker: str = "btc", compact: bool = False, token_budget: int = DEFAULT_TOKEN_BUDGET
+) -> str:
+    """crypto_rss_feeds for callers already inside an event loop (agent tools)."""
+    return _format_feeds(await fetch_feeds_async(CRYPTO_RSS_FEEDS), ticker, compact, token_budget)
 
 
-def crypto_rss_feeds(ticker: str = "btc") -> None:
-    example_feeds = [
-        "https://cointelegraph.com/rss",
-        "https://bitcoinist.com/feed/",
-        "https://bitcoinethereumnews.com/feed/",
-        "https://cryptoverze.com/feed/",
-        "https://www.coolwallet.io/blogs/blog.atom",
-        "https://latinoreview.com/feed/",
-        "https://bitrss.com/rss.xml",
-        "https://coinlabz.com/feed/",
-        "https://crypto.news/feed/",
-        "https://cryptobriefing.com/feed/",
-        "https://99bitcoins.com/feed/",
-        "https://cryptopotato.com/feed/",
-        "https://www.newsbtc.com/feed/",
-    ]
+def _format_feeds(
+    feed_results: Dict[str, List[Dict[str, Any]]], ticker: str, compact: bool, token_budget: int
+) -> str:
     all_entries: List[Dict[str, Any]] = []
-    for feed_url in example_feeds:
-        entries = extract_feed_entries(feed_url)
+    for feed_url, entries in feed_results.items():
         for entry in entries:
             entry_with_source = dict(entry)
             entry_with_source['source'] = feed_url
             all_entries.append(entry_with_source)
 
     if ticker:
-        all_entries = [entry for entry in all_entries if ticker.lower() in entry['title'].lower()]
-    return json.dumps(all_entries, indent=2, ensure_ascii=False)
\ No newline at end of file
+        # Index this call's entries by position: no shared state, and entries
+        # without a link (or sharing one) are matched on their own text
+        index = CryptoNewsIndex()
+        for position, entry in enumerate(all_entries):
+            index.add(position, entry)
+        all_entries = [all_entries[position] for position in sorted(index.lookup(ticker))]
+    if compact:
+        return compact_news(all_entries, ticker, token_budget=token_budget)
+    return json.dumps(all_entries, indent=2, ensure_ascii=False)
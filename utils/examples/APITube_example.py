@@ -6,11 +6,19 @@ This example demonstrates how to fetch news articles using the APITube API.
 You need to get an API key from https://apitube.io/
 """
 
-import requests
+from pathlib import Path
+import sys
 import json
 import os
 from typing import Dict, List, Optional
 import dotenv
+
+# Ensure project root is on sys.path so `utils` can be imported when running directly
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.http_client import get_http_client
 dotenv.load_dotenv()
 
 class APITubeClient:
@@ -72,7 +80,7 @@ class APITubeClient:
         if sort_order:
             params["sort.order"] = sort_order
         
-        response = requests.get(url, headers=self.headers, params=params)
+        response = get_http_client().get(url, headers=self.headers, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -100,7 +108,7 @@ class APITubeClient:
         if category:
             params["category"] = category
         
-        response = requests.get(url, headers=self.headers, params=params)
+        response = get_http_client().get(url, headers=self.headers, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the concurrent crypto RSS fetch engine.
+
+Serves fixture feeds from a local HTTP stub (each feed with its own artificial
+latency) and compares sequential extract_feed_entries calls against the
+fetch_feeds fan-out, including a run where the deadline cuts off a slow feed,
+a conditional-GET revalidation (304) run and a fresh-cache run.
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ensure project root is on sys.path so `utils` can be imported when running directly
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils import crypto_rss_utils
+from utils.crypto_rss_utils import extract_feed_entries, fetch_feeds
+
+# Per-feed latency in seconds; the last one is deliberately slower than the deadline.
+FEED_DELAYS = [0.3, 0.5, 0.2, 0.8, 0.4, 0.6, 0.3, 0.7, 0.5, 0.2, 0.4, 0.9, 5.0]
+ENTRIES_PER_FEED = 30
+
+
+def build_fixture_feed(feed_id: int) -> bytes:
+    items = "".join(
+        f"<item><title>Bitcoin and ETH update {feed_id}-{i}</title>"
+        f"<link>https://example.com/{feed_id}/{i}</link>"
+        f"<pubDate>Mon, 25 Aug 2025 10:{i % 60:02d}:00 GMT</pubDate>"
+        f"<description>&lt;p&gt;Fixture summary {i} for feed {feed_id}.&lt;/p&gt;</description></item>"
+        for i in range(ENTRIES_PER_FEED)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Fixture feed {feed_id}</title>{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+class FixtureFeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        feed_id = int(self.path.strip("/").split("/")[-1])
+        time.sleep(FEED_DELAYS[feed_id])
+        etag = f'"fixture-{feed_id}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = build_fixture_feed(feed_id)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureFeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    feed_urls = [f"{base_url}/feed/{i}" for i in range(len(FEED_DELAYS))]
+
+    print(f"Serving {len(feed_urls)} fixture feeds at {base_url}")
+    print(f"Sum of feed latencies: {sum(FEED_DELAYS):.1f}s, slowest: {max(FEED_DELAYS):.1f}s\n")
+
+    # Cold runs each get an empty cache directory
+    crypto_rss_utils.FEED_CACHE_DIR = tempfile.mkdtemp()
+    start = time.perf_counter()
+    sequential = [extract_feed_entries(url, ttl=0) for url in feed_urls]
+    elapsed = time.perf_counter() - start
+    print(f"Sequential:             {elapsed:6.2f}s, {sum(map(len, sequential))} entries")
+
+    crypto_rss_utils.FEED_CACHE_DIR = tempfile.mkdtemp()
+    start = time.perf_counter()
+    concurrent = fetch_feeds(feed_urls, deadline=10.0, ttl=0)
+    elapsed = time.perf_counter() - start
+    print(f"Concurrent:             {elapsed:6.2f}s, {sum(map(len, concurrent.values()))} entries")
+
+    crypto_rss_utils.FEED_CACHE_DIR = tempfile.mkdtemp()
+    start = time.perf_counter()
+    cut_off = fetch_feeds(feed_urls, deadline=2.0, ttl=0)
+    elapsed = time.perf_counter() - start
+    missing = [url for url, entries in cut_off.items() if not entries]
+    print(f"Concurrent, 2.0s limit: {elapsed:6.2f}s, {sum(map(len, cut_off.values()))} entries, "
+          f"{len(missing)} feed(s) dropped by the deadline")
+
+    # Warm cache from the previous run: ttl=0 forces If-None-Match revalidation
+    cached_urls = [url for url in feed_urls if cut_off[url]]
+    start = time.perf_counter()
+    revalidated = fetch_feeds(cached_urls, deadline=2.0, ttl=0)
+    elapsed = time.perf_counter() - start
+    print(f"Revalidated (304):      {elapsed:6.2f}s, {sum(map(len, revalidated.values()))} entries")
+
+    start = time.perf_counter()
+    fresh = fetch_feeds(cached_urls, deadline=2.0, ttl=300)
+    elapsed = time.perf_counter() - start
+    print(f"Fresh cache hit:        {elapsed:6.2f}s, {sum(map(len, fresh.values()))} entries")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from utils.interface import get_google_news
+from utils.interface import get_google_news, get_google_news_many
 
 # Load environment variables from .env
 dotenv.load_dotenv()
@@ -130,38 +130,32 @@ class GoogleNewsAnalyzer:
         """
         print(f"Batch fetching news for {len(queries)} queries (last {look_back_days} days)...")
         
+        # One concurrent call over a shared session instead of one query at a time
+        try:
+            news_by_query = get_google_news_many(
+                queries=queries,
+                curr_date=self.curr_date,
+                look_back_days=look_back_days
+            )
+        except Exception as e:
+            print(f"Error processing batch: {e}")
+            return [{
+                "success": False,
+                "query": query,
+                "look_back_days": look_back_days,
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            } for query in queries]
+        
         results = []
-        for i, query in enumerate(queries, 1):
-            print(f"Processing query {i}/{len(queries)}: {query}")
-            
-            try:
-                result = get_google_news(
-                    query=query,
-                    curr_date=self.curr_date,
-                    look_back_days=look_back_days
-                )
-                
-                results.append({
-                    "success": True,
-                    "query": query,
-                    "look_back_days": look_back_days,
-                    "result": result,
-                    "timestamp": datetime.now().isoformat()
-                })
-                
-            except Exception as e:
-                results.append({
-                    "success": False,
-                    "query": query,
-                    "look_back_days": look_back_days,
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat()
-                })
-                print(f"Error processing query '{query}': {e}")
-            
-            # Add a small delay to avoid overwhelming the API
-            import time
-            time.sleep(0.5)
+        for query in queries:
+            results.append({
+                "success": True,
+                "query": query,
+                "look_back_days": look_back_days,
+                "result": news_by_query[query],
+                "timestamp": datetime.now().isoformat()
+            })
         
         return results
     
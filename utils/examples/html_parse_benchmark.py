@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the news page extractors.
+
+Parses the saved fixture pages in examples/fixtures with the BeautifulSoup
+extraction (html.parser and lxml tree builders) and with the precompiled
+XPath fast path in utils.html_extract, checks that every variant returns the
+same items, and prints the time per page.
+"""
+
+from functools import partial
+from pathlib import Path
+import sys
+import time
+
+# Ensure project root is on sys.path so `utils` can be imported when running directly
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils import futurenews_hexun_utils, googlenews_utils
+from utils.html_extract import extract_google_news, extract_hexun_items
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+ROUNDS = 200
+
+
+def timed(func, *args):
+    func(*args)  # warm up
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = func(*args)
+    return result, (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def bench(name, variants, *args):
+    print(f"\n{name}")
+    baseline = None
+    reference = None
+    for label, func in variants:
+        result, ms = timed(func, *args)
+        if reference is None:
+            reference, baseline = result, ms
+        status = "same output" if result == reference else "OUTPUT DIFFERS"
+        print(f"  {label:<28} {ms:8.3f} ms/page  x{baseline / ms:5.1f}  {status}")
+
+
+def main():
+    hexun_html = (FIXTURES / "hexun_integratednews.html").read_text(encoding="utf-8")
+    google_html = (FIXTURES / "google_news_results.html").read_bytes()
+
+    bench(
+        "Hexun integrated news",
+        [
+            ("BeautifulSoup (lxml)", futurenews_hexun_utils._extract_items_bs),
+            ("BeautifulSoup (html.parser)", partial(futurenews_hexun_utils._extract_items_bs, features="html.parser")),
+            ("lxml XPath", extract_hexun_items),
+        ],
+        hexun_html,
+        futurenews_hexun_utils.URL,
+    )
+    bench(
+        "Google News results",
+        [
+            ("BeautifulSoup (html.parser)", googlenews_utils._parse_news_page_bs),
+            ("BeautifulSoup (lxml)", partial(googlenews_utils._parse_news_page_bs, features="lxml")),
+            ("lxml XPath", extract_google_news),
+        ],
+        google_html,
+    )
+
+
+if __name__ == "__main__":
+    main()
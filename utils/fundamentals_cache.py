@@ -0,0 +1,248 @@
+"""
+Persistent cache of Yahoo Finance fundamentals.
+
+Entries are keyed by (symbol, dataset), where dataset is the yf.Ticker
+attribute ("info", "financials", "balance_sheet", "cashflow",
+"recommendations", "calendar"). Frames are pickled and dicts stored as
+JSON under `<DATA_DIR>/fundamentals_cache/<symbol>/`, next to a meta.json
+recording when each dataset was fetched and when it expires.
+
+An entry expires after its dataset's TTL or at the company's next earnings
+date (plus a grace period for the filings to appear), whichever is first;
+the earnings date comes from the cached calendar. yf.Ticker objects are
+kept in an in-process LRU together with the values already loaded, so
+repeated lookups touch neither the network nor the disk. A failed or empty
+fetch falls back to the expired copy if there is one.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Annotated, Any, Dict, Optional
+
+import pandas as pd
+import yfinance as yf
+import dotenv
+
+dotenv.load_dotenv()
+FUNDAMENTALS_CACHE_DIR = os.path.join(os.getenv("DATA_DIR") or "data_cache", "fundamentals_cache")
+# Tickers (and their loaded datasets) kept in memory
+TICKER_CACHE_SIZE = int(os.getenv("FUNDAMENTALS_TICKER_CACHE_SIZE", "64"))
+
+DAY = 86400.0
+STATEMENT_TTL = float(os.getenv("FUNDAMENTALS_STATEMENT_TTL_DAYS", "30")) * DAY
+INFO_TTL = float(os.getenv("FUNDAMENTALS_INFO_TTL_HOURS", "24")) * 3600
+DATASET_TTLS = {
+    "info": INFO_TTL,
+    "financials": STATEMENT_TTL,
+    "balance_sheet": STATEMENT_TTL,
+    "cashflow": STATEMENT_TTL,
+    "recommendations": INFO_TTL,
+    "calendar": DAY,
+}
+# Statements are refreshed this long after an earnings date
+EARNINGS_GRACE = DAY
+# Empty results are only remembered in memory, for this long
+EMPTY_TTL = 300.0
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    return not value
+
+
+def _copy(value: Any) -> Any:
+    # Callers get their own copy so the cached frame is never mutated
+    return value.copy() if isinstance(value, (pd.DataFrame, pd.Series)) else value
+
+
+class FundamentalsCache:
+    """TTL cache of per-symbol Yahoo Finance datasets, refreshed at earnings dates."""
+
+    def __init__(
+        self,
+        root: str = FUNDAMENTALS_CACHE_DIR,
+        ttls: Optional[Dict[str, float]] = None,
+        max_tickers: int = TICKER_CACHE_SIZE,
+        ticker_factory=yf.Ticker,
+    ):
+        self.root = root
+        self.ttls = dict(DATASET_TTLS, **(ttls or {}))
+        self.max_tickers = max_tickers
+        self.ticker_factory = ticker_factory
+        # symbol -> {"ticker": yf.Ticker, "values": {dataset: (expires_at, value)}}, least recent first
+        self.slots: "OrderedDict[str, dict]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol)
+
+    def _slot(self, symbol: str) -> dict:
+        with self.lock:
+            slot = self.slots.get(symbol)
+            if slot is None:
+                slot = self.slots[symbol] = {"ticker": self.ticker_factory(symbol), "values": {}}
+                while len(self.slots) > self.max_tickers:
+                    self.slots.popitem(last=False)
+            else:
+                self.slots.move_to_end(symbol)
+            return slot
+
+    def get_ticker(self, symbol: Annotated[str, "ticker symbol"]) -> yf.Ticker:
+        """The shared yf.Ticker for the symbol."""
+        return self._slot(symbol.upper())["ticker"]
+
+    def load_meta(self, symbol: str) -> dict:
+        try:
+            with open(os.path.join(self._dir(symbol), "meta.json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self, symbol: str, meta: dict):
+        path = os.path.join(self._dir(symbol), "meta.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _load_value(self, symbol: str, entry: dict) -> Any:
+        path = os.path.join(self._dir(symbol), entry["file"])
+        if entry["file"].endswith(".pkl"):
+            return pd.read_pickle(path)
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _store_value(self, symbol: str, dataset: str, value: Any, expires_at: float):
+        os.makedirs(self._dir(symbol), exist_ok=True)
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            name = f"{dataset}.pkl"
+            tmp_path = os.path.join(self._dir(symbol), f"{name}.{os.getpid()}.tmp")
+            value.to_pickle(tmp_path)
+        else:
+            name = f"{dataset}.json"
+            tmp_path = os.path.join(self._dir(symbol), f"{name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                # Dates in info/calendar become ISO strings
+                json.dump(value, f, default=str)
+        os.replace(tmp_path, os.path.join(self._dir(symbol), name))
+
+        meta = self.load_meta(symbol)
+        meta[dataset] = {"file": name, "fetched_at": time.time(), "expires_at": expires_at}
+        self._save_meta(symbol, meta)
+
+    def next_earnings(self, symbol: Annotated[str, "ticker symbol"]) -> Optional[float]:
+        """Unix time of the next known earnings date, from the cached calendar."""
+        try:
+            calendar = self.get(symbol, "calendar")
+        except Exception:
+            return None
+        now = time.time()
+        dates = []
+        for value in (calendar or {}).get("Earnings Date", []):
+            try:
+                dates.append(pd.Timestamp(value).timestamp())
+            except (TypeError, ValueError):
+                continue
+        upcoming = [date for date in dates if date > now]
+        return min(upcoming) if upcoming else None
+
+    def _expires_at(self, symbol: str, dataset: str) -> float:
+        expires_at = time.time() + self.ttls.get(dataset, INFO_TTL)
+        if dataset != "calendar":
+            earnings = self.next_earnings(symbol)
+            if earnings is not None:
+                expires_at = min(expires_at, earnings + EARNINGS_GRACE)
+        return expires_at
+
+    def get(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        dataset: Annotated[str, "yf.Ticker attribute, e.g. financials"],
+        refresh: Annotated[bool, "fetch even if the cached copy is fresh"] = False,
+    ) -> Any:
+        """The dataset from memory, disk or Yahoo Finance, in that order."""
+        symbol = symbol.upper()
+        slot = self._slot(symbol)
+        now = time.time()
+
+        cached = slot["values"].get(dataset)
+        if cached is not None and not refresh and cached[0] > now:
+            return _copy(cached[1])
+
+        stale = None
+        entry = self.load_meta(symbol).get(dataset)
+        if entry is not None:
+            try:
+                stale = self._load_value(symbol, entry)
+            except Exception:
+                stale = None
+            if stale is not None and not refresh and entry["expires_at"] > now:
+                slot["values"][dataset] = (entry["expires_at"], stale)
+                return _copy(stale)
+
+        try:
+            if cached is not None or entry is not None:
+                # The Ticker memoizes what it fetched; a fresh one re-downloads
+                slot["ticker"] = self.ticker_factory(symbol)
+            value = getattr(slot["ticker"], dataset)
+        except Exception as e:
+            if stale is None:
+                raise
+            print(f"Fundamentals cache: refreshing {dataset} for {symbol} failed ({e}); using the cached copy")
+            return _copy(stale)
+
+        if _is_empty(value):
+            # Not persisted: Yahoo returns empty data on transient failures too
+            if stale is not None:
+                return _copy(stale)
+            slot["values"][dataset] = (now + EMPTY_TTL, value)
+            return _copy(value)
+
+        expires_at = self._expires_at(symbol, dataset)
+        self._store_value(symbol, dataset, value, expires_at)
+        slot["values"][dataset] = (expires_at, value)
+        return _copy(value)
+
+    def invalidate(self, symbol: Annotated[str, "ticker symbol"]):
+        """Drop the symbol's in-memory state and mark every stored dataset expired."""
+        symbol = symbol.upper()
+        with self.lock:
+            self.slots.pop(symbol, None)
+        meta = self.load_meta(symbol)
+        if meta:
+            for entry in meta.values():
+                entry["expires_at"] = 0
+            self._save_meta(symbol, meta)
+
+    def ticker(self, symbol: Annotated[str, "ticker symbol"]) -> "CachedTicker":
+        return CachedTicker(self, symbol)
+
+
+class CachedTicker:
+    """
+    Stand-in for yf.Ticker whose fundamentals come from the cache; any other
+    attribute (history, dividends, ...) is read from the shared yf.Ticker.
+    """
+
+    def __init__(self, cache: FundamentalsCache, symbol: str):
+        self._cache = cache
+        self.ticker = symbol.upper()
+
+    info = property(lambda self: self._cache.get(self.ticker, "info"))
+    financials = property(lambda self: self._cache.get(self.ticker, "financials"))
+    balance_sheet = property(lambda self: self._cache.get(self.ticker, "balance_sheet"))
+    cashflow = property(lambda self: self._cache.get(self.ticker, "cashflow"))
+    recommendations = property(lambda self: self._cache.get(self.ticker, "recommendations"))
+    calendar = property(lambda self: self._cache.get(self.ticker, "calendar"))
+
+    def __getattr__(self, name: str):
+        return getattr(self._cache.get_ticker(self.ticker), name)
+
+
+fundamentals_cache = FundamentalsCache()
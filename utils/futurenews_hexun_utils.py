@@ -1,36 +1,30 @@
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-from requests.adapters import HTTPAdapter, Retry
+from .html_extract import HtmlExtractError, extract_hexun_items
+from .http_client import get_http_client
 
 URL = "https://futures.hexun.com/integratednews/index.html"
 
-def make_session():
-    """Create a requests session with retry logic and proper headers."""
-    s = requests.Session()
-    s.headers.update({
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/120.0.0.0 Safari/537.36"
-    })
-    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
-    s.mount("http://", HTTPAdapter(max_retries=retries))
-    s.mount("https://", HTTPAdapter(max_retries=retries))
-    return s
-
 def fetch_html(url: str) -> str:
     """Fetch HTML content from a URL with proper encoding handling."""
-    with make_session() as s:
-        r = s.get(url, timeout=15)
-        # Hexun pages often use GB encodings; gb18030 is a superset and safe.
-        r.encoding = r.apparent_encoding or "gb18030"
-        if not r.encoding or "utf" not in r.encoding.lower():
-            r.encoding = "gb18030"
-        return r.text
+    # Shared pooled client: retries 429/5xx with back-off, keeps the connection alive
+    r = get_http_client().get(url, timeout=15)
+    # Hexun pages often use GB encodings; gb18030 is a superset and safe.
+    r.encoding = r.apparent_encoding or "gb18030"
+    if not r.encoding or "utf" not in r.encoding.lower():
+        r.encoding = "gb18030"
+    return r.text
 
 def extract_items(html: str, base_url: str):
     """Extract news items from HTML content."""
-    soup = BeautifulSoup(html, "lxml")
+    try:
+        # Precompiled XPath over a bare lxml tree
+        return extract_hexun_items(html, base_url)
+    except HtmlExtractError:
+        return _extract_items_bs(html, base_url)
+
+def _extract_items_bs(html: str, base_url: str, features: str = "lxml"):
+    soup = BeautifulSoup(html, features)
     items = []
 
     # Prefer the known container if present
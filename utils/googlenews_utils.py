@@ -1,16 +1,33 @@
 import json
-import requests
+import os
+import threading
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import time
-import random
+from typing import Dict, List, Optional
 from tenacity import (
     retry,
     stop_after_attempt,
-    wait_exponential,
     retry_if_exception_type,
     retry_if_result,
 )
+from .html_extract import HtmlExtractError, extract_google_news
+from .http_client import get_http_client
+from .rate_limit import rate_limiter
+
+GOOGLE_HOST = "www.google.com"
+# Shared budget for Google requests; calls only wait once the burst is used up
+rate_limiter.configure(
+    GOOGLE_HOST,
+    rate=float(os.getenv("GOOGLE_NEWS_RATE", "0.5")),
+    capacity=float(os.getenv("GOOGLE_NEWS_BURST", "4")),
+)
+# Queries fetched at once by getNewsDataMany (still within the shared rate limit)
+MAX_CONCURRENCY = int(os.getenv("GOOGLE_NEWS_CONCURRENCY", "4"))
+REQUEST_TIMEOUT = 30
+MAX_RESULTS = int(os.getenv("GOOGLE_NEWS_MAX_RESULTS", "20"))
+
+_page_executor: Optional[ThreadPoolExecutor] = None
 
 
 def is_rate_limited(response):
@@ -18,26 +35,106 @@ def is_rate_limited(response):
     return response.status_code == 429
 
 
+# No tenacity wait: a 429 blocks the host's bucket (Retry-After or
+# exponential back-off), and the retry waits for it in acquire()
 @retry(
     retry=(retry_if_result(is_rate_limited)),
-    wait=wait_exponential(multiplier=1, min=4, max=60),
     stop=stop_after_attempt(5),
 )
 def make_request(url, headers):
-    """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    """Make a request within the per-host rate limit, with retry logic for rate limiting"""
+    rate_limiter.acquire(url)
+    return _send_request(url, headers)
+
+
+def _send_request(url, headers):
+    # 429s are retried through the rate limiter, not by the client
+    response = get_http_client().get(
+        url, headers=headers, timeout=REQUEST_TIMEOUT, retry_statuses=()
+    )
+    rate_limiter.feedback(url, response)
     return response
 
 
-def getNewsData(query, start_date, end_date):
+def _prefetch_request(url, headers, abandoned: threading.Event):
+    """
+    A speculative page request: sent only if the host has a token to spare
+    right now and the query has not finished meanwhile. Returns None when it
+    was not sent or was rate limited, so the caller requests the page itself.
+    """
+    if not rate_limiter.try_acquire(url):
+        return None
+    if abandoned.is_set():
+        return None
+    response = _send_request(url, headers)
+    return None if is_rate_limited(response) else response
+
+
+def parse_news_page(content):
+    """Parsed results of one Google News page, whether it had any result blocks, and whether it links a next page."""
+    try:
+        # Precompiled XPath over a bare lxml tree
+        return extract_google_news(content)
+    except HtmlExtractError:
+        return _parse_news_page_bs(content)
+
+
+def _parse_news_page_bs(content, features="html.parser"):
+    soup = BeautifulSoup(content, features)
+    results_on_page = soup.select("div.SoaBEf")
+    page_results = []
+    for el in results_on_page:
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            page_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            # print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+    # A page whose results all lack a field is not the end of the results
+    has_results = bool(results_on_page)
+    return page_results, has_results, soup.find("a", id="pnnext") is not None
+
+
+def _get_page_executor() -> ThreadPoolExecutor:
+    # Module-level pool for page requests; separate from getNewsDataMany's
+    # query threads so a query waiting on its pages never starves them.
+    global _page_executor
+    if _page_executor is None:
+        _page_executor = ThreadPoolExecutor(max_workers=2 * MAX_CONCURRENCY)
+    return _page_executor
+
+
+def getNewsData(query, start_date, end_date, max_results=None, prefetch=True):
     """
     Scrape Google News search results for a given query and date range.
     query: str - search query
     start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    max_results: int - maximum number of results to return (10 per page);
+        None uses GOOGLE_NEWS_MAX_RESULTS
+    prefetch: bool - while a page is in flight, request the next one too if
+        max_results needs it and the rate limiter has a token to spare
+        without waiting; a prefetched page the query ends up not needing is
+        dropped before it is sent if possible
     """
+    if max_results is None:
+        max_results = MAX_RESULTS
+    if max_results <= 0:
+        return []
+
     if "-" in start_date:
         start_date = datetime.strptime(start_date, "%Y-%m-%d")
         start_date = start_date.strftime("%m/%d/%Y")
@@ -53,60 +150,87 @@ def getNewsData(query, start_date, end_date):
         )
     }
 
-    news_results = []
-    page = 0
-    max_results = 20
-    
-    while len(news_results) < max_results:
+    def page_url(page):
         offset = page * 10
-        url = (
+        return (
             f"https://www.google.com/search?q={query}"
             f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
             f"&tbm=nws&start={offset}"
         )
 
-        try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
+    executor = _get_page_executor()
+    pages_needed = -(-max_results // 10)
+    abandoned = threading.Event()
+    pending = {}
+    news_results = []
+    page = 0
 
-            if not results_on_page:
-                break  # No more results found
+    try:
+        while len(news_results) < max_results:
+            try:
+                if prefetch and page + 1 < pages_needed and page + 1 not in pending:
+                    pending[page + 1] = executor.submit(
+                        _prefetch_request, page_url(page + 1), headers, abandoned
+                    )
+
+                response = None
+                future = pending.pop(page, None)
+                if future is not None:
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        print(f"Prefetching page {page} failed ({e}); requesting it again")
+                if response is None:
+                    response = make_request(page_url(page), headers)
+                page_results, has_results, has_next = parse_news_page(response.content)
+
+                if not has_results:
+                    break  # No more results found
 
-            for el in results_on_page:
                 # Stop if we've reached the maximum number of results
-                if len(news_results) >= max_results:
+                news_results.extend(page_results[: max_results - len(news_results)])
+
+                # Check for the "Next" link (pagination) and if we still need more results
+                if not has_next or len(news_results) >= max_results:
                     break
-                    
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    # print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Check for the "Next" link (pagination) and if we still need more results
-            next_link = soup.find("a", id="pnnext")
-            if not next_link or len(news_results) >= max_results:
-                break
 
-            page += 1
+                page += 1
 
-        except Exception as e:
-            print(f"Failed after multiple retries: {e}")
-            break
+            except Exception as e:
+                print(f"Failed after multiple retries: {e}")
+                break
+    finally:
+        # Speculative pages past the last one used: not sent if still waiting
+        abandoned.set()
+        for future in pending.values():
+            future.cancel()
 
     return news_results
+
+
+def getNewsDataMany(
+    queries: List[str],
+    start_date: str,
+    end_date: str,
+    max_workers: int = MAX_CONCURRENCY,
+    max_results: Optional[int] = None,
+) -> Dict[str, list]:
+    """
+    getNewsData for several queries at once over the shared session.
+    queries: list of search queries
+    start_date, end_date: as for getNewsData
+    max_workers: queries in flight at the same time; the per-host rate limit still applies
+    max_results: results per query, defaults to getNewsData's
+    Returns a dict mapping each query to its results.
+    """
+    queries = list(dict.fromkeys(queries))
+    if not queries:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as executor:
+        futures = {
+            query: executor.submit(
+                getNewsData, query, start_date, end_date, max_results
+            )
+            for query in queries
+        }
+        return {query: future.result() for query, future in futures.items()}
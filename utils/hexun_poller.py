@@ -0,0 +1,238 @@
+"""
+Incremental poller for the Hexun futures news pages.
+
+Each poll fetches the pages, keeps only headlines not seen before, and adds
+them to a bounded in-memory store with a character n-gram index, so keyword
+lookups ("原油", "黄金", "PTA") never touch HTML. Titles are split into runs
+of CJK characters and runs of ASCII letters/digits; each run contributes its
+single characters and adjacent pairs. A query is looked up through its own
+pairs and confirmed with the same case-insensitive substring test as
+hexun_news, so results are identical to filtering the titles directly.
+
+listing() returns what hexun_news would for the pages as of the latest poll;
+search() covers every retained headline (up to HEXUN_MAX_ITEMS).
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Annotated, Callable, Dict, List, Optional, Set
+import dotenv
+
+from .futurenews_hexun_utils import URL, extract_items, fetch_html
+
+dotenv.load_dotenv()
+HEXUN_PAGES = [URL]
+POLL_INTERVAL = float(os.getenv("HEXUN_POLL_INTERVAL", "300"))
+# Headlines kept (and indexed); those longest gone from the pages are evicted first
+MAX_ITEMS = int(os.getenv("HEXUN_MAX_ITEMS", "2000"))
+# Default number of titles returned from the retained history
+HEXUN_HISTORY_LIMIT = int(os.getenv("HEXUN_HISTORY_LIMIT", "50"))
+
+_RUN_RE = re.compile(
+    r"[㐀-䶿一-鿿豈-﫿぀-ヿ가-힯]+|[0-9a-z]+"
+)
+
+
+def title_runs(text: str) -> List[str]:
+    """Lowercased runs of CJK characters and of ASCII letters/digits."""
+    return _RUN_RE.findall(text.lower())
+
+
+def title_tokens(text: str) -> Set[str]:
+    """Index terms of a title: every character and adjacent pair within a run."""
+    tokens = set()
+    for run in title_runs(text):
+        tokens.update(run)
+        tokens.update(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def query_tokens(query: str) -> Set[str]:
+    """Terms a matching title must contain: pairs of each run (or the run itself if one character)."""
+    tokens = set()
+    for run in title_runs(query):
+        if len(run) == 1:
+            tokens.add(run)
+        else:
+            tokens.update(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+class HexunPoller:
+    """
+    Polls Hexun futures news pages (every `interval` seconds in a background
+    thread once started, or on demand when data is older than `interval`).
+    listing() answers from the headlines on the pages at the latest poll,
+    search() from every retained headline through the index.
+
+    New headlines are passed to `on_new` and queued for drain_new(); the
+    queue is capped at `max_items` as well, so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        pages: Annotated[Optional[List[str]], "page URLs to poll"] = None,
+        interval: Annotated[float, "seconds between polls"] = POLL_INTERVAL,
+        max_items: Annotated[int, "headlines kept in memory"] = MAX_ITEMS,
+        on_new: Annotated[Optional[Callable[[List[dict]], None]], "called with each batch of new headlines"] = None,
+        fetcher: Callable[[str], str] = fetch_html,
+    ):
+        self.pages = list(pages or HEXUN_PAGES)
+        self.interval = interval
+        self.max_items = max_items
+        self.on_new = on_new
+        self.fetcher = fetcher
+        # (title, url) -> item, least recently listed first
+        self.items: "OrderedDict[tuple, dict]" = OrderedDict()
+        self.postings: Dict[str, Set[tuple]] = {}
+        # Headlines on the pages at the latest poll that returned any, in page order
+        self.listed: List[dict] = []
+        self.new_items = deque(maxlen=max_items)
+        self.last_poll = 0.0
+        self.seq = 0
+        self.lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _add(self, key: tuple, item: dict):
+        self.items[key] = item
+        for token in title_tokens(item["title"]):
+            self.postings.setdefault(token, set()).add(key)
+
+    def _evict(self):
+        while len(self.items) > self.max_items:
+            key, item = self.items.popitem(last=False)
+            for token in title_tokens(item["title"]):
+                keys = self.postings.get(token)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.postings[token]
+
+    def poll_once(self) -> List[dict]:
+        """Fetch every page once and return the headlines not seen before, in page order."""
+        with self._poll_lock:
+            fetched = []
+            for page in self.pages:
+                try:
+                    fetched.extend(extract_items(self.fetcher(page), page))
+                except Exception as e:
+                    print(f"Hexun poll failed for {page}: {e}")
+
+            with self.lock:
+                self.seq += 1
+                new = []
+                listed = {}
+                for position, item in enumerate(fetched):
+                    key = (item["title"], item["url"])
+                    if key in listed:
+                        continue
+                    if key in self.items:
+                        # Still listed: keep it away from eviction so it is never re-reported
+                        self.items.move_to_end(key)
+                        listed[key] = self.items[key]
+                        continue
+                    item = dict(item, seq=self.seq, position=position, first_seen=time.time())
+                    self._add(key, item)
+                    listed[key] = item
+                    new.append(item)
+                self._evict()
+                if listed:
+                    # A poll where every page failed keeps the previous listing
+                    self.listed = list(listed.values())
+                self.new_items.extend(new)
+                self.last_poll = time.time()
+
+        if new and self.on_new is not None:
+            self.on_new(new)
+        return new
+
+    def refresh(self, max_age: Optional[float] = None) -> None:
+        """Poll now if the last poll is older than `max_age` (default: the poll interval)."""
+        max_age = self.interval if max_age is None else max_age
+        if time.time() - self.last_poll >= max_age:
+            self.poll_once()
+
+    def drain_new(self) -> List[dict]:
+        """Headlines first seen since the previous drain_new() call, oldest first."""
+        with self.lock:
+            new = list(self.new_items)
+            self.new_items.clear()
+        return new
+
+    def listing(
+        self,
+        query: Annotated[str, "keyword, e.g. 原油; empty for every headline"] = "",
+        limit: Annotated[Optional[int], "most titles returned; None for all"] = None,
+        refresh: Annotated[bool, "poll first if the data is older than the interval"] = True,
+    ) -> List[str]:
+        """Titles on the pages at the latest poll containing `query`, in page order, as hexun_news returns them."""
+        if refresh:
+            self.refresh()
+        needle = query.lower()
+        with self.lock:
+            titles = [item["title"] for item in self.listed if needle in item["title"].lower()]
+        return titles if limit is None else titles[:limit]
+
+    def search(
+        self,
+        query: Annotated[str, "keyword, e.g. 原油; empty for every headline"] = "",
+        limit: Annotated[Optional[int], "most titles returned; None for all"] = None,
+        refresh: Annotated[bool, "poll first if the data is older than the interval"] = True,
+    ) -> List[str]:
+        """Retained titles containing `query` (case-insensitive), newest poll first, page order within a poll."""
+        if refresh:
+            self.refresh()
+        with self.lock:
+            tokens = query_tokens(query)
+            if tokens:
+                # Rarest term first keeps the intersection small
+                postings = sorted((self.postings.get(t, set()) for t in tokens), key=len)
+                keys = set(postings[0]).intersection(*postings[1:])
+            else:
+                keys = self.items.keys()
+            needle = query.lower()
+            matches = [
+                self.items[key] for key in keys
+                if needle in self.items[key]["title"].lower()
+            ]
+        matches.sort(key=lambda item: (-item["seq"], item["position"]))
+        return [item["title"] for item in matches[:limit]]
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"Hexun poller error: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> "HexunPoller":
+        """Poll in a daemon thread every `interval` seconds until stop()."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="hexun-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+_poller: Optional[HexunPoller] = None
+_poller_lock = threading.Lock()
+
+
+def get_hexun_poller() -> HexunPoller:
+    """Return the shared poller (not started; it polls on demand until start() is called)."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = HexunPoller()
+        return _poller
@@ -0,0 +1,118 @@
+"""
+Fast extraction for the scraped news pages.
+
+Parses with lxml (libxml2) and runs XPath expressions compiled once at import
+instead of building a BeautifulSoup tree and interpreting CSS selectors on
+every call. The functions mirror the BeautifulSoup extraction in
+futurenews_hexun_utils / googlenews_utils, which remain the fallback: a page
+lxml cannot parse raises HtmlExtractError and the caller uses BeautifulSoup.
+"""
+
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:  # optional speed-up
+    lxml = None
+
+
+class HtmlExtractError(Exception):
+    """The fast path could not parse the page."""
+
+
+def _has_class(name: str) -> str:
+    # XPath equivalent of the CSS class selector `.name`
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if lxml is not None:
+    _PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+    # Hexun: `div.temp01 li a[href]`, or `li a[href]` anywhere without the container
+    _HEXUN_CONTAINER = lxml.etree.XPath(f"(//div[{_has_class('temp01')}])[1]")
+    _HEXUN_ANCHORS_IN = lxml.etree.XPath(".//li//a[@href]")
+    _HEXUN_ANCHORS = lxml.etree.XPath("//li//a[@href]")
+
+    # Google News result blocks and their fields
+    _GOOGLE_RESULTS = lxml.etree.XPath(f"//div[{_has_class('SoaBEf')}]")
+    _GOOGLE_LINK = lxml.etree.XPath("(.//a)[1]")
+    _GOOGLE_TITLE = lxml.etree.XPath(f"(.//div[{_has_class('MBeuO')}])[1]")
+    _GOOGLE_SNIPPET = lxml.etree.XPath(f"(.//*[{_has_class('GI74Re')}])[1]")
+    _GOOGLE_DATE = lxml.etree.XPath(f"(.//*[{_has_class('LfVVr')}])[1]")
+    _GOOGLE_SOURCE = lxml.etree.XPath(f"(.//*[{_has_class('NUnG9d')}]//span)[1]")
+    _GOOGLE_NEXT = lxml.etree.XPath("//a[@id='pnnext']")
+
+
+def _parse(html) -> "lxml.html.HtmlElement":
+    if lxml is None:
+        raise HtmlExtractError("lxml is not installed")
+    parser = None
+    if isinstance(html, bytes):
+        # Try UTF-8 first like BeautifulSoup's detection; otherwise let
+        # libxml2 go by the page's own charset declaration
+        try:
+            html.decode("utf-8")
+            parser = _PARSER
+        except UnicodeDecodeError:
+            pass
+    else:
+        html = html.encode("utf-8")
+        parser = _PARSER
+    try:
+        return lxml.html.fromstring(html, parser=parser)
+    except (lxml.etree.ParserError, ValueError) as e:
+        raise HtmlExtractError(e)
+
+
+def _first_text(xpath, el) -> Optional[str]:
+    found = xpath(el)
+    return found[0].text_content() if found else None
+
+
+def extract_hexun_items(html, base_url: str) -> List[dict]:
+    """Same result as futurenews_hexun_utils.extract_items."""
+    root = _parse(html)
+    container = _HEXUN_CONTAINER(root)
+    anchors = _HEXUN_ANCHORS_IN(container[0]) if container else _HEXUN_ANCHORS(root)
+
+    items = []
+    seen = set()
+    for a in anchors:
+        # BeautifulSoup get_text(strip=True): every text node stripped, then joined
+        title = "".join(s.strip() for s in a.itertext())
+        href = a.get("href", "").strip()
+        if not title or not href or href.lower().startswith("javascript"):
+            continue
+        url = urljoin(base_url, href)
+        key = (title, url)
+        if key in seen:
+            continue
+        seen.add(key)
+        items.append({"title": title, "url": url})
+    return items
+
+
+def extract_google_news(content) -> Tuple[List[dict], bool, bool]:
+    """Same result as googlenews_utils.parse_news_page."""
+    root = _parse(content)
+    results_on_page = _GOOGLE_RESULTS(root)
+    page_results = []
+    for el in results_on_page:
+        link = _GOOGLE_LINK(el)
+        fields = (
+            link[0].get("href") if link else None,
+            _first_text(_GOOGLE_TITLE, el),
+            _first_text(_GOOGLE_SNIPPET, el),
+            _first_text(_GOOGLE_DATE, el),
+            _first_text(_GOOGLE_SOURCE, el),
+        )
+        # If one of the fields is not found, skip this result
+        if any(field is None for field in fields):
+            continue
+        link, title, snippet, date, source = fields
+        page_results.append(
+            {"link": link, "title": title, "snippet": snippet, "date": date, "source": source}
+        )
+    return page_results, bool(results_on_page), bool(_GOOGLE_NEXT(root))
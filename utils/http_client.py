@@ -0,0 +1,221 @@
+"""
+Process-wide HTTP client shared by the news fetchers.
+
+One requests.Session with pooled keep-alive connections (urllib3 keeps a
+pool per host), a browser User-Agent, a default timeout and one retry policy:
+connection errors and retryable statuses are retried with exponential
+back-off, honouring Retry-After. Callers that handle rate limiting
+themselves (Google News) narrow the statuses per call.
+
+HTTP/2 is used for https:// when httpx with the h2 extra is installed
+(disable with HTTP_CLIENT_HTTP2=0); responses are still requests.Response
+objects, so callers do not care which transport served them.
+"""
+
+import os
+import threading
+import time
+from typing import Iterable, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+import dotenv
+
+from .rate_limit import parse_retry_after
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+except ImportError:  # optional dependency
+    httpx = None
+
+dotenv.load_dotenv()
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_CLIENT_TIMEOUT", "15"))
+DEFAULT_RETRIES = int(os.getenv("HTTP_CLIENT_RETRIES", "3"))
+BACKOFF_FACTOR = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Host pools kept open, and connections kept per host
+POOL_HOSTS = int(os.getenv("HTTP_CLIENT_POOL_HOSTS", "32"))
+POOL_MAXSIZE = int(os.getenv("HTTP_CLIENT_POOL_MAXSIZE", "32"))
+HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "1") != "0"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def _requests_error(e: Exception, request) -> Exception:
+    if isinstance(e, httpx.TimeoutException):
+        return requests.exceptions.Timeout(e, request=request)
+    return requests.exceptions.ConnectionError(e, request=request)
+
+
+class HttpxRaw:
+    """
+    The urllib3-style `raw` body of a Response served by Http2Adapter: a
+    streamed httpx response read with read1()/stream() and closed with close().
+    Chunks come back as they arrive (already decoded), so callers can check a
+    wall-clock limit between them.
+    """
+
+    def __init__(self, response, request):
+        self._response = response
+        self._request = request
+        self._chunks = response.iter_bytes()
+        self._pending = b""
+
+    def read1(self, amt: Optional[int] = None, decode_content: bool = True) -> bytes:
+        chunk, self._pending = self._pending, b""
+        if not chunk:
+            try:
+                chunk = next(self._chunks, b"")
+            except httpx.RequestError as e:
+                raise _requests_error(e, self._request)
+        if amt is not None and len(chunk) > amt:
+            chunk, self._pending = chunk[:amt], chunk[amt:]
+        return chunk
+
+    def stream(self, amt: int = 65536, decode_content: bool = True):
+        while True:
+            chunk = self.read1(amt)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        self._response.close()
+
+
+class Http2Adapter(BaseAdapter):
+    """requests transport adapter backed by a pooled httpx HTTP/2 client (TLS and proxies follow httpx defaults)."""
+
+    def __init__(self, pool_maxsize: int = POOL_MAXSIZE, transport=None):
+        super().__init__()
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+            transport=transport,
+        )
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            raw = self.client.send(
+                self.client.build_request(
+                    request.method,
+                    request.url,
+                    headers=dict(request.headers),
+                    content=request.body,
+                    timeout=timeout,
+                ),
+                stream=True,
+            )
+        except httpx.RequestError as e:
+            raise _requests_error(e, request)
+
+        response = requests.Response()
+        response.status_code = raw.status_code
+        response.headers = CaseInsensitiveDict(raw.headers.multi_items())
+        # Like urllib3's: streamed on demand, so stream=True callers bound the body read themselves
+        response.raw = HttpxRaw(raw, request)
+        response.url = str(raw.url)
+        response.reason = raw.reason_phrase
+        response.request = request
+        response.connection = self
+        content_type = response.headers.get("content-type", "")
+        if "charset=" in content_type:
+            response.encoding = content_type.split("charset=")[-1].split(";")[0].strip()
+        if not stream:
+            try:
+                response.content
+            finally:
+                raw.close()
+        return response
+
+    def close(self):
+        self.client.close()
+
+
+class HttpClient:
+    """Shared session plus the retry/timeout policy applied to every request."""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+        http2: bool = HTTP2,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_statuses = tuple(retry_statuses)
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.http2 = bool(http2 and httpx is not None)
+        if self.http2:
+            self.session.mount("https://", Http2Adapter())
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        delay = None
+        if response is not None:
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+        if delay is None:
+            delay = BACKOFF_FACTOR * 2 ** attempt
+        return min(delay, BACKOFF_MAX)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout=None,
+        retries: Optional[int] = None,
+        retry_statuses: Optional[Iterable[int]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        session.request with the shared policy. `retries` / `retry_statuses`
+        override the defaults for this call (retries=0 disables retrying).
+        Returns the last response, even if its status was retryable.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        retry_statuses = self.retry_statuses if retry_statuses is None else tuple(retry_statuses)
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= retries:
+                    raise
+                time.sleep(self._backoff(attempt, None))
+            else:
+                if response.status_code not in retry_statuses or attempt >= retries:
+                    return response
+                time.sleep(self._backoff(attempt, response))
+                response.close()
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
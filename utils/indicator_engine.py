@@ -0,0 +1,433 @@
+"""
+Incremental technical indicators.
+
+Each indicator keeps the recursive state it needs (adjusted EWM sums for
+EMAs and Wilder averages, rolling sums / sums of squares for windows), so
+appending a bar costs O(1). Formulas follow stockstats exactly (adjusted
+EWM, min_periods=1 windows, same warm-up conventions), so values match
+what `wrap(df)[indicator]` returns. Missing (non-finite) inputs are skipped
+the way pandas skips NaN, so a gap never reaches the running sums.
+
+Indicators that stockstats derives from the same intermediates form one
+group (macd/macds/macdh, boll/boll_ub/boll_lb): a group is updated once per
+bar and its outputs are persisted together.
+"""
+
+import json
+import math
+import os
+import re
+import numpy as np
+import pandas as pd
+from collections import deque
+from typing import Annotated, Optional
+
+from .price_store import PriceStore, price_store
+
+
+class EwmState:
+    """Adjusted exponential mean (pandas `ewm(adjust=True)`): S/W with S, W decayed by 1 - alpha."""
+
+    def __init__(self, alpha: float, s: float = 0.0, w: float = 0.0):
+        self.alpha = alpha
+        self.s = s
+        self.w = w
+
+    def update(self, x: float) -> float:
+        decay = 1.0 - self.alpha
+        # A missing value only ages the earlier weights (pandas ignore_na=False)
+        finite = math.isfinite(x)
+        self.s = (x if finite else 0.0) + decay * self.s
+        self.w = (1.0 if finite else 0.0) + decay * self.w
+        return self.s / self.w if self.w > 0 else float("nan")
+
+    def to_dict(self) -> dict:
+        return {"alpha": self.alpha, "s": self.s, "w": self.w}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "EwmState":
+        return cls(d["alpha"], d["s"], d["w"])
+
+
+class RollingState:
+    """
+    Last `size` values with their running sum and sum of squares (min_periods=1
+    windows). Non-finite values take a slot in the window but are left out of
+    the sums and the count, like NaN in a pandas rolling window.
+    """
+
+    def __init__(self, size: int, values=(), total: float = 0.0, total_sq: float = 0.0):
+        self.size = size
+        self.values = deque(values, maxlen=size)
+        self.total = total
+        self.total_sq = total_sq
+        self.finite = sum(1 for v in self.values if math.isfinite(v))
+
+    def update(self, x: float):
+        if len(self.values) == self.size:
+            old = self.values[0]
+            if math.isfinite(old):
+                self.total -= old
+                self.total_sq -= old * old
+                self.finite -= 1
+        self.values.append(x)
+        if math.isfinite(x):
+            self.total += x
+            self.total_sq += x * x
+            self.finite += 1
+        if not self.finite:
+            # Drop rounding residue once the window holds no values
+            self.total = self.total_sq = 0.0
+
+    @property
+    def count(self) -> int:
+        return self.finite
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else float("nan")
+
+    def std(self) -> float:
+        # Sample standard deviation (ddof=1), NaN for a single value like pandas
+        n = self.count
+        if n < 2:
+            return float("nan")
+        var = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(max(var, 0.0))
+
+    def to_dict(self) -> dict:
+        return {"size": self.size, "values": list(self.values), "total": self.total, "total_sq": self.total_sq}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RollingState":
+        return cls(d["size"], d["values"], d["total"], d["total_sq"])
+
+
+def ema_state(span: int) -> EwmState:
+    return EwmState(2.0 / (span + 1))
+
+
+def wilder_state(window: int) -> EwmState:
+    return EwmState(1.0 / window)
+
+
+def _typical_price(bar: dict) -> float:
+    return (bar["close"] + bar["high"] + bar["low"]) / 3.0
+
+
+class IncrementalIndicator:
+    """
+    Base class: subclasses define `update(bar)` and keep their state in
+    `self.state`. update returns one value per name in `outputs`.
+    """
+
+    def __init__(self, name: str, state: Optional[dict] = None):
+        self.outputs = (name,)
+        self.name = name
+        self.state = state if state is not None else self.initial_state()
+
+    def initial_state(self) -> dict:
+        raise NotImplementedError
+
+    def update(self, bar: dict) -> float:
+        raise NotImplementedError
+
+    def dump_state(self) -> dict:
+        return {k: v.to_dict() if hasattr(v, "to_dict") else v for k, v in self.state.items()}
+
+
+class SmaIndicator(IncrementalIndicator):
+    def __init__(self, name, window, state=None):
+        self.window = window
+        super().__init__(name, state)
+
+    def initial_state(self):
+        return {"window": RollingState(self.window)}
+
+    def update(self, bar):
+        self.state["window"].update(bar["close"])
+        return (self.state["window"].mean(),)
+
+
+class EmaIndicator(IncrementalIndicator):
+    def __init__(self, name, span, state=None):
+        self.span = span
+        super().__init__(name, state)
+
+    def initial_state(self):
+        return {"ema": ema_state(self.span)}
+
+    def update(self, bar):
+        return (self.state["ema"].update(bar["close"]),)
+
+
+class MacdIndicator(IncrementalIndicator):
+    """macd = EMA12 - EMA26, macds = EMA9(macd), macdh = macd - macds."""
+
+    def __init__(self, name="macd", state=None):
+        super().__init__(name, state)
+        self.outputs = ("macd", "macds", "macdh")
+
+    def initial_state(self):
+        return {"fast": ema_state(12), "slow": ema_state(26), "signal": ema_state(9)}
+
+    def update(self, bar):
+        macd = self.state["fast"].update(bar["close"]) - self.state["slow"].update(bar["close"])
+        macds = self.state["signal"].update(macd)
+        return macd, macds, macd - macds
+
+
+class RsiIndicator(IncrementalIndicator):
+    """RSI(14) from Wilder-smoothed gains and losses; the first bar is 50."""
+
+    def initial_state(self):
+        return {"up": wilder_state(14), "down": wilder_state(14), "prev_close": None}
+
+    def update(self, bar):
+        prev_close = self.state["prev_close"]
+        diff = 0.0 if prev_close is None else bar["close"] - prev_close
+        if math.isfinite(bar["close"]):
+            self.state["prev_close"] = bar["close"]
+        up = self.state["up"].update(max(diff, 0.0) if math.isfinite(diff) else diff)
+        down = self.state["down"].update(max(-diff, 0.0) if math.isfinite(diff) else diff)
+        if prev_close is None or up + down == 0:
+            return (50.0,)
+        return (100.0 * up / (up + down),)
+
+
+class AtrIndicator(IncrementalIndicator):
+    """ATR(14): Wilder average of the true range; the first bar uses its own close as previous close."""
+
+    def initial_state(self):
+        return {"tr": wilder_state(14), "prev_close": None}
+
+    def update(self, bar):
+        prev_close = self.state["prev_close"]
+        if prev_close is None:
+            prev_close = bar["close"]
+        if math.isfinite(bar["close"]):
+            self.state["prev_close"] = bar["close"]
+        ranges = (bar["high"] - bar["low"], abs(bar["high"] - prev_close), abs(bar["low"] - prev_close))
+        # max() would silently pick a finite range over a missing one
+        tr = max(ranges) if all(math.isfinite(r) for r in ranges) else float("nan")
+        return (self.state["tr"].update(tr),)
+
+
+class BollIndicator(IncrementalIndicator):
+    """Bollinger bands: 20-bar SMA +/- 2 sample standard deviations."""
+
+    def __init__(self, name="boll", state=None):
+        super().__init__(name, state)
+        self.outputs = ("boll", "boll_ub", "boll_lb")
+
+    def initial_state(self):
+        return {"window": RollingState(20)}
+
+    def update(self, bar):
+        window = self.state["window"]
+        window.update(bar["close"])
+        mean = window.mean()
+        width = 2 * window.std()
+        return mean, mean + width, mean - width
+
+
+class VwmaIndicator(IncrementalIndicator):
+    """VWMA(14) over the typical price."""
+
+    def initial_state(self):
+        return {"tpv": RollingState(14), "volume": RollingState(14)}
+
+    def update(self, bar):
+        self.state["tpv"].update(_typical_price(bar) * bar["volume"])
+        self.state["volume"].update(bar["volume"])
+        volume = self.state["volume"].total
+        return (self.state["tpv"].total / volume if volume != 0 else 0.0,)
+
+
+class MfiIndicator(IncrementalIndicator):
+    """MFI(14) as a 0-1 ratio like stockstats; 0.5 during the first 14 bars."""
+
+    def initial_state(self):
+        return {"pos": RollingState(14), "neg": RollingState(14), "prev_tp": None, "bars": 0}
+
+    def update(self, bar):
+        tp = _typical_price(bar)
+        prev_tp = self.state["prev_tp"]
+        diff = 0.0 if prev_tp is None else tp - prev_tp
+        flow = tp * bar["volume"]
+        if math.isfinite(tp):
+            self.state["prev_tp"] = tp
+        if math.isfinite(diff) and math.isfinite(flow):
+            pos, neg = (flow if diff > 0 else 0.0), (flow if diff < 0 else 0.0)
+        else:
+            pos = neg = float("nan")
+        self.state["pos"].update(pos)
+        self.state["neg"].update(neg)
+        self.state["bars"] += 1
+        total = self.state["pos"].total + self.state["neg"].total
+        if self.state["bars"] <= 14 or total <= 0:
+            return (0.5,)
+        return (self.state["pos"].total / total,)
+
+
+_SIMPLE_INDICATORS = {
+    "macd": MacdIndicator,
+    "rsi": RsiIndicator,
+    "atr": AtrIndicator,
+    "boll": BollIndicator,
+    "vwma": VwmaIndicator,
+    "mfi": MfiIndicator,
+}
+# Outputs computed by another indicator's update -> that indicator
+_GROUPS = {
+    "macds": "macd", "macdh": "macd",
+    "boll_ub": "boll", "boll_lb": "boll",
+}
+_WINDOWED_RE = re.compile(r"^close_(\d+)_(sma|ema)$")
+
+
+def indicator_group(indicator: str) -> str:
+    """Name under which the indicator's values are computed and stored (macds -> macd)."""
+    return _GROUPS.get(indicator, indicator)
+
+
+def supports(indicator: str) -> bool:
+    return indicator_group(indicator) in _SIMPLE_INDICATORS or bool(_WINDOWED_RE.match(indicator))
+
+
+def make_indicator(indicator: str, state: Optional[dict] = None) -> IncrementalIndicator:
+    """The incremental implementation computing `indicator` (and its group siblings)."""
+    if state is not None:
+        state = {
+            k: (RollingState.from_dict(v) if "size" in v else EwmState.from_dict(v))
+            if isinstance(v, dict) else v
+            for k, v in state.items()
+        }
+    match = _WINDOWED_RE.match(indicator)
+    if match:
+        window, kind = int(match.group(1)), match.group(2)
+        cls = SmaIndicator if kind == "sma" else EmaIndicator
+        return cls(indicator, window, state)
+    group = indicator_group(indicator)
+    if group in _SIMPLE_INDICATORS:
+        return _SIMPLE_INDICATORS[group](group, state)
+    raise ValueError(f"Indicator {indicator} has no incremental implementation")
+
+
+class IndicatorEngine:
+    """
+    Keeps indicator values and state next to the price store:
+    `<store>/<key>/indicators/<group>.json` (state, outputs, bars consumed,
+    store revision) and `<group>.f8` (raw float64 rows, one value per output,
+    appended in place). New bars in the store are folded in incrementally; a
+    rewritten dataset (different revision) triggers a one-off rebuild.
+    """
+
+    def __init__(self, store: PriceStore = price_store):
+        self.store = store
+
+    def supports(self, indicator: str) -> bool:
+        return supports(indicator)
+
+    def _paths(self, key: str, group: str):
+        base = os.path.join(self.store.root, key, "indicators")
+        return base, os.path.join(base, f"{group}.json"), os.path.join(base, f"{group}.f8")
+
+    def _load(self, key: str, group: str) -> Optional[dict]:
+        _, state_path, _ = self._paths(key, group)
+        try:
+            with open(state_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def update(
+        self,
+        key: Annotated[str, "price store dataset key"],
+        indicator: Annotated[str, "indicator name, e.g. rsi or close_50_sma"],
+    ) -> int:
+        """Bring the stored values of the indicator's group up to date; returns the number of bars processed."""
+        meta = self.store.meta(key)
+        if meta is None:
+            raise FileNotFoundError(f"No price data stored for {key}")
+        group = indicator_group(indicator)
+        base, state_path, values_path = self._paths(key, group)
+
+        engine = make_indicator(group)
+        width = len(engine.outputs)
+        saved = self._load(key, group)
+        if (
+            saved is None
+            or saved["revision"] != meta.get("revision")
+            or saved.get("outputs") != list(engine.outputs)
+            or saved["rows"] > meta["rows"]
+            or not os.path.exists(values_path)
+            or os.path.getsize(values_path) != saved["rows"] * 8 * width
+        ):
+            saved = None
+        rows = saved["rows"] if saved else 0
+        if saved and rows == meta["rows"]:
+            return 0
+
+        if saved:
+            engine = make_indicator(group, saved["state"])
+        bars = self.store.read_columns(key, ["Close", "High", "Low", "Volume"], start_row=rows)
+        closes, highs, lows, volumes = (bars[c] for c in ("Close", "High", "Low", "Volume"))
+        values = np.empty((len(closes), width), dtype="<f8")
+        for i in range(len(closes)):
+            values[i] = engine.update({
+                "close": float(closes[i]),
+                "high": float(highs[i]),
+                "low": float(lows[i]),
+                "volume": float(volumes[i]),
+            })
+
+        os.makedirs(base, exist_ok=True)
+        with open(values_path, "ab" if saved else "wb") as f:
+            f.write(values.tobytes())
+        tmp_path = f"{state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "indicator": group,
+                "outputs": list(engine.outputs),
+                "rows": meta["rows"],
+                "revision": meta.get("revision"),
+                "last_date": meta["last_date"],
+                "state": engine.dump_state(),
+            }, f)
+        os.replace(tmp_path, state_path)
+        return len(values)
+
+    def frame(
+        self,
+        key: Annotated[str, "price store dataset key"],
+        indicators: Annotated[list, "indicator names, e.g. macd, macds, rsi"],
+    ) -> pd.DataFrame:
+        """Values of several indicators, indexed by trading date; each group is updated and read once."""
+        dates = self.store.read_columns(key, ["Date"])["Date"]
+        columns = {}
+        groups = {}
+        for indicator in indicators:
+            groups.setdefault(indicator_group(indicator), []).append(indicator)
+        for group, members in groups.items():
+            self.update(key, group)
+            _, state_path, values_path = self._paths(key, group)
+            outputs = self._load(key, group)["outputs"]
+            values = np.fromfile(values_path, dtype="<f8", count=len(dates) * len(outputs))
+            values = values.reshape(len(dates), len(outputs))
+            for indicator in members:
+                columns[indicator] = values[:, outputs.index(indicator)]
+        return pd.DataFrame(
+            {indicator: columns[indicator] for indicator in indicators},
+            index=pd.DatetimeIndex(dates),
+        )
+
+    def series(
+        self,
+        key: Annotated[str, "price store dataset key"],
+        indicator: Annotated[str, "indicator name, e.g. rsi or close_50_sma"],
+    ) -> pd.Series:
+        """Indicator values for the whole dataset, indexed by trading date."""
+        return self.frame(key, [indicator])[indicator]
+
+
+indicator_engine = IndicatorEngine()
@@ -1,5 +1,8 @@
-from typing import Annotated
-from .reddit_utils import fetch_top_from_category
+from typing import Annotated, Optional
+from .reddit_utils import (
+    fetch_top_from_category_range,
+    fetch_top_from_category_range_batch,
+)
 from .yfin_utils import *
 from .stockstats_utils import *
 from .googlenews_utils import *
@@ -7,29 +10,50 @@ from dateutil.relativedelta import relativedelta
 from datetime import datetime
 import os
 import pandas as pd
-from tqdm import tqdm
 import yfinance as yf
 from openai import OpenAI
-from .googlenews_utils import getNewsData
+from .googlenews_utils import getNewsData, getNewsDataMany
 import dotenv
-from .futurenews_hexun_utils import hexun_news
-from .crypto_rss_utils import crypto_rss_feeds
+from .hexun_poller import HEXUN_HISTORY_LIMIT, get_hexun_poller
+from .crypto_rss_utils import crypto_rss_feeds, crypto_rss_feeds_async
+from .news_format import DEFAULT_TOKEN_BUDGET
+from .crypto_news_store import get_crypto_news_since as _get_crypto_news_since
 
 dotenv.load_dotenv()
 DATA_DIR = os.getenv("DATA_DIR")
 
-def get_hexun_news(query: str = "") -> str:
-    news = hexun_news(query)
+def get_hexun_news(query: str = "", limit: Optional[int] = None) -> str:
+    # Headlines currently on the page, as hexun_news returns them; the page is
+    # re-fetched only when the last poll is older than HEXUN_POLL_INTERVAL
+    news = get_hexun_poller().listing(query, limit)
     return news
 
-def get_crypto_rss_feeds(ticker: str = "btc") -> str:
-    news = crypto_rss_feeds(ticker)
+def get_hexun_news_history(query: str = "", limit: Optional[int] = HEXUN_HISTORY_LIMIT) -> str:
+    # Every headline the shared poller retained, newest first, from its keyword index
+    news = get_hexun_poller().search(query, limit)
+    return news
+
+def get_crypto_rss_feeds(
+    ticker: str = "btc", compact: bool = False, token_budget: int = DEFAULT_TOKEN_BUDGET
+) -> str:
+    news = crypto_rss_feeds(ticker, compact=compact, token_budget=token_budget)
+    return news
+
+async def get_crypto_rss_feeds_async(
+    ticker: str = "btc", compact: bool = False, token_budget: int = DEFAULT_TOKEN_BUDGET
+) -> str:
+    news = await crypto_rss_feeds_async(ticker, compact=compact, token_budget=token_budget)
+    return news
+
+def get_crypto_news_since(cursor: int = 0, ticker: str = "") -> str:
+    news = _get_crypto_news_since(cursor, ticker)
     return news
 
 def get_google_news(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
+    max_results: Annotated[Optional[int], "Maximum number of news results; None uses GOOGLE_NEWS_MAX_RESULTS"] = None,
 ) -> str:
     query = query.replace(" ", "+")
 
@@ -37,8 +61,12 @@ def get_google_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    news_results = getNewsData(query, before, curr_date)
+    news_results = getNewsData(query, before, curr_date, max_results)
+
+    return _format_google_news(query, news_results, before, curr_date)
+
 
+def _format_google_news(query: str, news_results: list, before: str, curr_date: str) -> str:
     news_str = ""
 
     for news in news_results:
@@ -52,6 +80,33 @@ def get_google_news(
     return f"## {query} Google News, from {before} to {curr_date}:\n\n{news_str}"
 
 
+def get_google_news_many(
+    queries: Annotated[list[str], "Queries to search with"],
+    curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"],
+    max_results: Annotated[Optional[int], "Maximum number of news results per query; None uses GOOGLE_NEWS_MAX_RESULTS"] = None,
+) -> dict[str, str]:
+    """
+    get_google_news for several queries, fetched concurrently over one
+    keep-alive session within the shared Google rate limit
+    Returns:
+        dict[str, str]: query -> the block get_google_news returns for it
+    """
+    start_date = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = start_date - relativedelta(days=look_back_days)
+    before = before.strftime("%Y-%m-%d")
+
+    search_queries = {query: query.replace(" ", "+") for query in queries}
+    news_by_query = getNewsDataMany(
+        list(search_queries.values()), before, curr_date, max_results=max_results
+    )
+
+    return {
+        query: _format_google_news(search_query, news_by_query[search_query], before, curr_date)
+        for query, search_query in search_queries.items()
+    }
+
+
 def get_reddit_global_news(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
@@ -66,30 +121,19 @@ def get_reddit_global_news(
         str: A formatted dataframe containing the latest news articles posts on reddit and meta information in these columns: "created_utc", "id", "title", "selftext", "score", "num_comments", "url"
     """
 
+    end_date = start_date
     start_date = datetime.strptime(start_date, "%Y-%m-%d")
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
-
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
+    # One pass over each subreddit file for the whole range
+    posts = fetch_top_from_category_range(
+        "global_news",
+        before,
+        end_date,
+        max_limit_per_day,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
+    )
 
     if len(posts) == 0:
         return ""
@@ -101,7 +145,7 @@ def get_reddit_global_news(
         else:
             news_str += f"### {post['title']}\n\n{post['content']}\n\n"
 
-    return f"## Global News Reddit, from {before} to {curr_date}:\n{news_str}"
+    return f"## Global News Reddit, from {before} to {end_date}:\n{news_str}"
 
 
 def get_reddit_company_news(
@@ -120,36 +164,25 @@ def get_reddit_company_news(
         str: A formatted dataframe containing the latest news articles posts on reddit and meta information in these columns: "created_utc", "id", "title", "selftext", "score", "num_comments", "url"
     """
 
+    end_date = start_date
     start_date = datetime.strptime(start_date, "%Y-%m-%d")
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {ticker} on {start_date}",
-        total=total_iterations,
+    # One pass over each subreddit file for the whole range
+    posts = fetch_top_from_category_range(
+        "company_news",
+        before,
+        end_date,
+        max_limit_per_day,
+        ticker,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
     )
 
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            max_limit_per_day,
-            ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-
-        pbar.update(1)
+    return _format_reddit_company_news(ticker, posts, before, end_date)
 
-    pbar.close()
 
+def _format_reddit_company_news(ticker: str, posts: list, before: str, end_date: str) -> str:
     if len(posts) == 0:
         return ""
 
@@ -160,7 +193,120 @@ def get_reddit_company_news(
         else:
             news_str += f"### {post['title']}\n\n{post['content']}\n\n"
 
-    return f"##{ticker} News Reddit, from {before} to {curr_date}:\n\n{news_str}"
+    return f"##{ticker} News Reddit, from {before} to {end_date}:\n\n{news_str}"
+
+
+def get_reddit_company_news_batch(
+    tickers: Annotated[list[str], "ticker symbols of the companies"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"],
+    max_limit_per_day: Annotated[int, "Maximum number of news per day, per ticker"],
+) -> dict[str, str]:
+    """
+    Retrieve the latest top reddit news for several companies, reading the
+    company_news corpus once for all of them
+    Args:
+        tickers: ticker symbols of the companies
+        start_date: Start date in yyyy-mm-dd format
+        look_back_days: how many days to look back
+        max_limit_per_day: Maximum number of news per day, per ticker
+    Returns:
+        dict[str, str]: ticker -> the same block get_reddit_company_news returns for it
+    """
+
+    end_date = start_date
+    start_date = datetime.strptime(start_date, "%Y-%m-%d")
+    before = start_date - relativedelta(days=look_back_days)
+    before = before.strftime("%Y-%m-%d")
+
+    # Each post is routed to every ticker it mentions in a single corpus pass
+    posts_by_ticker = fetch_top_from_category_range_batch(
+        "company_news",
+        before,
+        end_date,
+        max_limit_per_day,
+        tickers,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
+    )
+
+    return {
+        ticker: _format_reddit_company_news(ticker, posts, before, end_date)
+        for ticker, posts in posts_by_ticker.items()
+    }
+
+
+best_ind_params = {
+    # Moving Averages
+    "close_50_sma": (
+        "50 SMA: A medium-term trend indicator. "
+        "Usage: Identify trend direction and serve as dynamic support/resistance. "
+        "Tips: It lags price; combine with faster indicators for timely signals."
+    ),
+    "close_200_sma": (
+        "200 SMA: A long-term trend benchmark. "
+        "Usage: Confirm overall market trend and identify golden/death cross setups. "
+        "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
+    ),
+    "close_10_ema": (
+        "10 EMA: A responsive short-term average. "
+        "Usage: Capture quick shifts in momentum and potential entry points. "
+        "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
+    ),
+    # MACD Related
+    "macd": (
+        "MACD: Computes momentum via differences of EMAs. "
+        "Usage: Look for crossovers and divergence as signals of trend changes. "
+        "Tips: Confirm with other indicators in low-volatility or sideways markets."
+    ),
+    "macds": (
+        "MACD Signal: An EMA smoothing of the MACD line. "
+        "Usage: Use crossovers with the MACD line to trigger trades. "
+        "Tips: Should be part of a broader strategy to avoid false positives."
+    ),
+    "macdh": (
+        "MACD Histogram: Shows the gap between the MACD line and its signal. "
+        "Usage: Visualize momentum strength and spot divergence early. "
+        "Tips: Can be volatile; complement with additional filters in fast-moving markets."
+    ),
+    # Momentum Indicators
+    "rsi": (
+        "RSI: Measures momentum to flag overbought/oversold conditions. "
+        "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
+        "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
+    ),
+    # Volatility Indicators
+    "boll": (
+        "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
+        "Usage: Acts as a dynamic benchmark for price movement. "
+        "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
+    ),
+    "boll_ub": (
+        "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
+        "Usage: Signals potential overbought conditions and breakout zones. "
+        "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
+    ),
+    "boll_lb": (
+        "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
+        "Usage: Indicates potential oversold conditions. "
+        "Tips: Use additional analysis to avoid false reversal signals."
+    ),
+    "atr": (
+        "ATR: Averages true range to measure volatility. "
+        "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
+        "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
+    ),
+    # Volume-Based Indicators
+    "vwma": (
+        "VWMA: A moving average weighted by volume. "
+        "Usage: Confirm trends by integrating price action with volume data. "
+        "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+    ),
+    "mfi": (
+        "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
+        "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
+        "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
+    ),
+}
 
 
 def get_stock_stats_indicators_window(
@@ -173,79 +319,6 @@ def get_stock_stats_indicators_window(
     online: Annotated[bool, "to fetch data online or offline"] = True,
 ) -> str:
 
-    best_ind_params = {
-        # Moving Averages
-        "close_50_sma": (
-            "50 SMA: A medium-term trend indicator. "
-            "Usage: Identify trend direction and serve as dynamic support/resistance. "
-            "Tips: It lags price; combine with faster indicators for timely signals."
-        ),
-        "close_200_sma": (
-            "200 SMA: A long-term trend benchmark. "
-            "Usage: Confirm overall market trend and identify golden/death cross setups. "
-            "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
-        ),
-        "close_10_ema": (
-            "10 EMA: A responsive short-term average. "
-            "Usage: Capture quick shifts in momentum and potential entry points. "
-            "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
-        ),
-        # MACD Related
-        "macd": (
-            "MACD: Computes momentum via differences of EMAs. "
-            "Usage: Look for crossovers and divergence as signals of trend changes. "
-            "Tips: Confirm with other indicators in low-volatility or sideways markets."
-        ),
-        "macds": (
-            "MACD Signal: An EMA smoothing of the MACD line. "
-            "Usage: Use crossovers with the MACD line to trigger trades. "
-            "Tips: Should be part of a broader strategy to avoid false positives."
-        ),
-        "macdh": (
-            "MACD Histogram: Shows the gap between the MACD line and its signal. "
-            "Usage: Visualize momentum strength and spot divergence early. "
-            "Tips: Can be volatile; complement with additional filters in fast-moving markets."
-        ),
-        # Momentum Indicators
-        "rsi": (
-            "RSI: Measures momentum to flag overbought/oversold conditions. "
-            "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
-            "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
-        ),
-        # Volatility Indicators
-        "boll": (
-            "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
-            "Usage: Acts as a dynamic benchmark for price movement. "
-            "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
-        ),
-        "boll_ub": (
-            "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
-            "Usage: Signals potential overbought conditions and breakout zones. "
-            "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
-        ),
-        "boll_lb": (
-            "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
-            "Usage: Indicates potential oversold conditions. "
-            "Tips: Use additional analysis to avoid false reversal signals."
-        ),
-        "atr": (
-            "ATR: Averages true range to measure volatility. "
-            "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
-            "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
-        ),
-        # Volume-Based Indicators
-        "vwma": (
-            "VWMA: A moving average weighted by volume. "
-            "Usage: Confirm trends by integrating price action with volume data. "
-            "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-        ),
-        "mfi": (
-            "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
-            "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
-            "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
-        ),
-    }
-
     if indicator not in best_ind_params:
         raise ValueError(
             f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
@@ -255,39 +328,31 @@ def get_stock_stats_indicators_window(
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
-        )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
-
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-                )
-
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-            )
-
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
+    # Compute the indicator once, then slice the window by date range
+    try:
+        series = StockstatsUtils.get_stock_stats_series(symbol, indicator, online)
+        window = series.loc[pd.Timestamp(before) : pd.Timestamp(curr_date)]
+        window_values = {
+            date.strftime("%Y-%m-%d"): str(value) for date, value in window.items()
+        }
+    except Exception as e:
+        if not online:
+            raise
+        print(f"Error getting stockstats indicator data for indicator {indicator}: {e}")
+        window_values = None
+
+    ind_string = ""
+    while curr_date >= before:
+        date_str = curr_date.strftime("%Y-%m-%d")
+        if window_values is None:
+            ind_string += f"{date_str}: \n"
+        elif date_str in window_values:
+            ind_string += f"{date_str}: {window_values[date_str]}\n"
+        elif online:
+            # offline only lists trading dates; online reports the gap
+            ind_string += f"{date_str}: N/A: Not a trading day (weekend or holiday)\n"
+
+        curr_date = curr_date - relativedelta(days=1)
 
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
@@ -299,6 +364,52 @@ def get_stock_stats_indicators_window(
     return result_str
 
 
+def get_stock_stats_indicators_batch(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicators: Annotated[list[str], "technical indicators to get the analysis and report of"],
+    curr_date: Annotated[
+        str, "The current trading date you are trading on, YYYY-mm-dd"
+    ],
+    look_back_days: Annotated[int, "how many days to look back"],
+    online: Annotated[bool, "to fetch data online or offline"] = True,
+) -> str:
+    """
+    Report several indicators over the same window as one table.
+    Price data is loaded once and all indicators are computed on the same
+    frame, so shared intermediates (EMAs for the MACD family, the 20-day
+    SMA/std for the Bollinger bands) are calculated only once.
+    """
+    unsupported = [ind for ind in indicators if ind not in best_ind_params]
+    if unsupported:
+        raise ValueError(
+            f"Indicators {unsupported} are not supported. Please choose from: {list(best_ind_params.keys())}"
+        )
+    indicators = list(dict.fromkeys(indicators))
+
+    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = curr_date_dt - relativedelta(days=look_back_days)
+
+    frame = StockstatsUtils.get_stock_stats_frame(symbol, indicators, online)
+    window = frame.loc[pd.Timestamp(before) : pd.Timestamp(curr_date_dt)].iloc[::-1]
+    window.index = window.index.strftime("%Y-%m-%d")
+    window.index.name = "Date"
+
+    with pd.option_context(
+        "display.max_rows", None, "display.max_columns", None, "display.width", None
+    ):
+        table = window.to_string()
+
+    descriptions = "\n".join(
+        f"- {ind}: {best_ind_params[ind]}" for ind in indicators
+    )
+    return (
+        f"## {', '.join(indicators)} values for {symbol} from {before.strftime('%Y-%m-%d')} to {curr_date} (trading days):\n\n"
+        + table
+        + "\n\n"
+        + descriptions
+    )
+
+
 def get_stockstats_indicator(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -383,6 +494,45 @@ def get_YFin_data_online(
     # Fetch historical data for the specified date range
     data = ticker.history(start=start_date, end=end_date)
 
+    return _format_yfin_data(symbol, start_date, end_date, data)
+
+
+BATCH_PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def get_YFin_data_online_batch(
+    symbols: Annotated[list[str], "ticker symbols of the companies"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> dict[str, str]:
+    """
+    get_YFin_data_online for a watchlist: all symbols are refreshed in the
+    local price cache with one grouped download and each range is read from
+    the cache. Returns the CSV report per symbol, with the same header and
+    Open/High/Low/Close/Volume columns; unlike ticker.history, the cached
+    prices carry no Dividends / Stock Splits columns.
+    """
+    datetime.strptime(start_date, "%Y-%m-%d")
+    datetime.strptime(end_date, "%Y-%m-%d")
+
+    # end_date is exclusive, as in ticker.history
+    last_date = (pd.Timestamp(end_date) - pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    frames = get_stock_data_batch(symbols, start_date, last_date)
+    reports = {}
+    for symbol in symbols:
+        data = frames.get(symbol.upper())
+        if data is None:
+            data = pd.DataFrame()
+        else:
+            # Column order and integer volume as in ticker.history
+            data = data.set_index("Date")[[c for c in BATCH_PRICE_COLUMNS if c in data.columns]]
+            if "Volume" in data.columns and data["Volume"].notna().all():
+                data["Volume"] = data["Volume"].astype("int64")
+        reports[symbol] = _format_yfin_data(symbol, start_date, end_date, data)
+    return reports
+
+
+def _format_yfin_data(symbol: str, start_date: str, end_date: str, data: pd.DataFrame) -> str:
     # Check if data is empty
     if data.empty:
         return (
@@ -390,7 +540,7 @@ def get_YFin_data_online(
         )
 
     # Remove timezone info from index for cleaner output
-    if data.index.tz is not None:
+    if getattr(data.index, "tz", None) is not None:
         data.index = data.index.tz_localize(None)
 
     # Round numerical values to 2 decimal places for cleaner display
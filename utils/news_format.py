@@ -0,0 +1,127 @@
+import html
+import math
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+from .crypto_news_index import tokenize, ticker_aliases
+
+DEFAULT_TOKEN_BUDGET = 3000
+DEFAULT_SUMMARY_CHARS = 280
+# Recency half-life for ranking, in hours.
+RECENCY_HALF_LIFE = 24.0
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def strip_html(text: str) -> str:
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text or ""))).strip()
+
+
+def truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English news text)."""
+    return math.ceil(len(text) / 4)
+
+
+def parse_published(published: str) -> Optional[float]:
+    """Epoch seconds for an RSS (RFC 822) or Atom (ISO 8601) date, or None."""
+    if not published:
+        return None
+    try:
+        return parsedate_to_datetime(published).timestamp()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(published.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _source_label(source: str) -> str:
+    return urlsplit(source).netloc or source
+
+
+def score_entry(entry: Dict[str, Any], alias_tokens: List[List[str]], now: float) -> float:
+    """Relevance (alias hits, title weighted double) decayed by article age."""
+    hits = 1
+    if alias_tokens:
+        title_tokens = set(tokenize(entry.get("title", "")))
+        summary_tokens = set(tokenize(entry.get("summary", "")))
+        for tokens in alias_tokens:
+            if all(t in title_tokens for t in tokens):
+                hits += 2
+            elif all(t in summary_tokens for t in tokens):
+                hits += 1
+    published = parse_published(entry.get("published", ""))
+    age_hours = (now - published) / 3600 if published else 7 * 24
+    return hits * 0.5 ** (max(age_hours, 0) / RECENCY_HALF_LIFE)
+
+
+def compact_news(
+    entries: List[Dict[str, Any]],
+    ticker: str = "",
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    max_summary_chars: int = DEFAULT_SUMMARY_CHARS,
+    include_links: bool = True,
+) -> str:
+    """
+    Serialize news entries as compact pipe-separated lines for an LLM tool result.
+    HTML is stripped, summaries truncated, sources interned into a header table,
+    and entries are emitted best-first (relevance x recency) while they fit in
+    token_budget; an entry too long for what is left is skipped, so shorter
+    ones further down can still use it.
+    """
+    now = time.time()
+    alias_tokens = [tokenize(alias) for alias in ticker_aliases(ticker)] if ticker else []
+    ranked = sorted(entries, key=lambda e: score_entry(e, alias_tokens, now), reverse=True)
+
+    sources: Dict[str, str] = {}
+    lines: List[str] = []
+    used = 0
+    for entry in ranked:
+        source = entry.get("source", "")
+        source_id = sources.get(source, f"s{len(sources)}")
+        published = parse_published(entry.get("published", ""))
+        date = (
+            datetime.fromtimestamp(published, timezone.utc).strftime("%Y-%m-%d %H:%M")
+            if published else "?"
+        )
+        fields = [
+            source_id,
+            date,
+            strip_html(entry.get("title", "")).replace("|", "/"),
+            truncate(strip_html(entry.get("summary", "")), max_summary_chars).replace("|", "/"),
+        ]
+        if include_links:
+            fields.append(entry.get("link", ""))
+        line = "|".join(fields)
+
+        cost = estimate_tokens(line)
+        if source not in sources:
+            cost += estimate_tokens(f" {source_id}={_source_label(source)}")
+        if used + cost > token_budget:
+            continue
+        used += cost
+        sources.setdefault(source, source_id)
+        lines.append(line)
+
+    source_table = " ".join(
+        f"{source_id}={_source_label(source)}" for source, source_id in sources.items()
+    )
+    header = (
+        f"# news{' for ' + ticker.upper() if ticker else ''}: {len(lines)} of {len(entries)} entries, "
+        f"best first (relevance x recency)\n"
+        f"# sources: {source_table}\n"
+        f"# format: source|published UTC|title|summary{'|link' if include_links else ''}\n"
+    )
+    return header + "\n".join(lines)
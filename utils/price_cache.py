@@ -0,0 +1,305 @@
+import copy
+import json
+import os
+import re
+import subprocess
+import pandas as pd
+import yfinance as yf
+from typing import Annotated, Dict, Iterable, List, Optional
+import dotenv
+
+from .price_store import PriceStore, price_store, normalize_price_frame
+
+dotenv.load_dotenv()
+DATA_DIR = os.getenv("DATA_DIR") or "data_cache"
+
+# Old per-day cache files written by the online stockstats path
+LEGACY_FILE_RE = re.compile(
+    r"^(?P<symbol>.+)-YFin-data-(?P<start>\d{4}-\d{2}-\d{2})-(?P<end>\d{4}-\d{2}-\d{2})\.csv$"
+)
+# The fixed snapshot used by the offline path; never merged or deleted
+OFFLINE_SNAPSHOT_RANGE = ("2015-01-01", "2025-03-25")
+HISTORY_YEARS = 15
+# Relative close-price mismatch on the overlapping bar that means Yahoo has
+# re-adjusted the history (split or dividend) and the tail cannot be appended
+ADJUSTMENT_TOLERANCE = 1e-3
+
+
+def tracked_files(directory: str) -> Optional[set]:
+    """
+    Real paths of the files under `directory` tracked by git (empty outside a
+    work tree); None when git cannot be run, so nothing counts as disposable.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", directory, "ls-files", "-z"],
+            capture_output=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return set()
+    return {
+        os.path.realpath(os.path.join(directory, name))
+        for name in result.stdout.decode("utf-8", "surrogateescape").split("\0")
+        if name
+    }
+
+
+def download_prices(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    data = yf.download(
+        symbol,
+        start=start_date,
+        end=end_date,
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=True,
+    )
+    return data.reset_index()
+
+
+def download_prices_many(symbols: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+    """One grouped, threaded download for several symbols; empty frames for symbols without data."""
+    data = yf.download(
+        symbols,
+        start=start_date,
+        end=end_date,
+        group_by="ticker",
+        threads=True,
+        progress=False,
+        auto_adjust=True,
+    )
+    present = set(data.columns.get_level_values(0)) if isinstance(data.columns, pd.MultiIndex) else set()
+    frames = {}
+    for symbol in symbols:
+        if symbol in present:
+            # Rows exist for the union of trading days; drop the ones this symbol lacks
+            frame = data[symbol].dropna(how="all")
+            frame.columns.name = None
+        else:
+            frame = pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+        frames[symbol] = frame.reset_index()
+    return frames
+
+
+class PriceCache:
+    """
+    Per-symbol daily price cache on top of the columnar PriceStore.
+
+    The dataset for a symbol records the date it is covered up to
+    (`covered_until`, exclusive like yfinance's `end`). A refresh downloads
+    only the missing tail and appends it; the overlapping last bar is used to
+    detect re-adjusted history, in which case the symbol is re-downloaded.
+
+    A manifest (`<store>/manifest.json`) lists the legacy
+    `{symbol}-YFin-data-{start}-{end}.csv` files merged into each dataset, so
+    collect_garbage() can remove them once they are no longer needed.
+    """
+
+    def __init__(
+        self,
+        store: PriceStore = price_store,
+        data_dir: str = DATA_DIR,
+        downloader=download_prices,
+        batch_downloader=download_prices_many,
+    ):
+        self.store = store
+        self.data_dir = data_dir
+        self.downloader = downloader
+        self.batch_downloader = batch_downloader
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.store.root, "manifest.json")
+
+    def load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: dict):
+        os.makedirs(self.store.root, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def legacy_files(self, symbol: str) -> List[str]:
+        """Per-day CSV caches for the symbol, oldest end date first."""
+        if not os.path.isdir(self.data_dir):
+            return []
+        files = []
+        for name in os.listdir(self.data_dir):
+            match = LEGACY_FILE_RE.match(name)
+            if not match or match.group("symbol") != symbol:
+                continue
+            if (match.group("start"), match.group("end")) == OFFLINE_SNAPSHOT_RANGE:
+                continue
+            files.append((match.group("end"), os.path.join(self.data_dir, name)))
+        return [path for _, path in sorted(files)]
+
+    def _bootstrap(self, symbol: str, today: str) -> List[str]:
+        """
+        Seed the dataset from the newest legacy CSV if any, otherwise from a
+        full download. Older legacy files overlap the newest one (possibly with
+        stale adjustments), so they are only recorded as superseded.
+        """
+        start_date = (pd.Timestamp(today) - pd.DateOffset(years=HISTORY_YEARS)).strftime("%Y-%m-%d")
+        legacy = self.legacy_files(symbol)
+        if legacy:
+            data = pd.read_csv(legacy[-1])
+            match = LEGACY_FILE_RE.match(os.path.basename(legacy[-1]))
+            start_date, covered_until = match.group("start"), match.group("end")
+        else:
+            data = self.downloader(symbol, start_date, today)
+            covered_until = today
+        if data.empty:
+            raise Exception(f"Price cache: no data for {symbol}")
+        self.store.write(symbol, data, covered_until=covered_until, covered_from=start_date)
+        return self._disposable(legacy)
+
+    def _disposable(self, paths: List[str]) -> List[str]:
+        # Files under version control are inputs, never cache leftovers
+        if not paths:
+            return []
+        tracked = tracked_files(self.data_dir)
+        if tracked is None:
+            return []
+        return [path for path in paths if os.path.realpath(path) not in tracked]
+
+    def _history_readjusted(self, symbol: str, meta: dict, tail: pd.DataFrame) -> bool:
+        if tail.empty:
+            return False
+        overlap = tail[tail["Date"] == pd.Timestamp(meta["last_date"])]
+        if overlap.empty:
+            return False
+        stored_close = self.store.read(symbol, start_date=meta["last_date"])["Close"].iloc[0]
+        return abs(overlap["Close"].iloc[0] / stored_close - 1) > ADJUSTMENT_TOLERANCE
+
+    def refresh(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        today: Annotated[Optional[str], "exclusive end date, YYYY-mm-dd; defaults to today"] = None,
+    ) -> str:
+        """Bring the symbol's dataset up to `today` and return its store key."""
+        symbol = symbol.upper()
+        today = today or pd.Timestamp.today().strftime("%Y-%m-%d")
+        manifest = self.load_manifest()
+        before = copy.deepcopy(manifest)
+        entry = manifest.setdefault(symbol, {"merged_files": []})
+
+        meta = self.store.meta(symbol)
+        if meta is None:
+            merged = self._bootstrap(symbol, today)
+            entry["merged_files"] = sorted(set(entry["merged_files"]) | set(merged))
+            meta = self.store.meta(symbol)
+
+        if meta["covered_until"] < today:
+            # Re-fetch the last stored bar as well to check it still matches
+            tail = self.downloader(symbol, meta["last_date"], today)
+            self._apply_tail(symbol, meta, tail, today)
+
+        entry["covered_until"] = today
+        entry["last_date"] = self.store.meta(symbol)["last_date"]
+        # Repeat lookups on an up-to-date symbol stay read-only
+        if manifest != before:
+            self._save_manifest(manifest)
+        return symbol
+
+    def _apply_tail(self, symbol: str, meta: dict, tail: pd.DataFrame, today: str):
+        if not tail.empty:
+            tail = normalize_price_frame(tail)
+        if self._history_readjusted(symbol, meta, tail):
+            # Split/dividend re-adjustment upstream: replace the history (new revision)
+            data = self.downloader(symbol, meta["first_date"], today)
+            self.store.write(
+                symbol, data, covered_until=today, covered_from=meta.get("covered_from", meta["first_date"])
+            )
+        else:
+            self.store.append(symbol, tail, covered_until=today)
+
+    def refresh_many(
+        self,
+        symbols: Annotated[Iterable[str], "ticker symbols"],
+        today: Annotated[Optional[str], "exclusive end date, YYYY-mm-dd; defaults to today"] = None,
+        start_date: Annotated[Optional[str], "earliest date the history must cover, YYYY-mm-dd"] = None,
+    ) -> List[str]:
+        """
+        refresh() for several symbols with grouped downloads: one request per
+        distinct start date (new symbols start HISTORY_YEARS back or at
+        `start_date` if earlier, stored ones at their last bar), so a
+        watchlist refreshed together is a single round trip. A stored symbol
+        whose history was fetched from later than `start_date` is downloaded
+        again from there. Symbols Yahoo returns nothing for are reported and
+        left out; returns the store keys of the others.
+        """
+        today = today or pd.Timestamp.today().strftime("%Y-%m-%d")
+        symbols = list(dict.fromkeys(symbols))
+        manifest = self.load_manifest()
+        before = copy.deepcopy(manifest)
+        history_start = (pd.Timestamp(today) - pd.DateOffset(years=HISTORY_YEARS)).strftime("%Y-%m-%d")
+        if start_date:
+            history_start = min(history_start, start_date)
+
+        # (start date, full history?) -> symbols to download from it
+        pending: Dict[tuple, List[str]] = {}
+        for symbol in symbols:
+            entry = manifest.setdefault(symbol, {"merged_files": []})
+            meta = self.store.meta(symbol)
+            if meta is None and self.legacy_files(symbol):
+                merged = self._bootstrap(symbol, today)
+                entry["merged_files"] = sorted(set(entry["merged_files"]) | set(merged))
+                meta = self.store.meta(symbol)
+            if meta is None or history_start < meta.get("covered_from", meta["first_date"]):
+                pending.setdefault((history_start, True), []).append(symbol)
+            elif meta["covered_until"] < today:
+                # Re-fetch the last stored bar as well to check it still matches
+                pending.setdefault((meta["last_date"], False), []).append(symbol)
+
+        missing = set()
+        for (group_start, full), group in pending.items():
+            for symbol, data in self.batch_downloader(group, group_start, today).items():
+                meta = self.store.meta(symbol)
+                if not full:
+                    self._apply_tail(symbol, meta, data, today)
+                elif not data.empty:
+                    self.store.write(symbol, data, covered_until=today, covered_from=group_start)
+                elif meta is None:
+                    print(f"Price cache: no data for {symbol}")
+                    missing.add(symbol)
+                    if manifest[symbol] == {"merged_files": []}:
+                        del manifest[symbol]
+                else:
+                    print(f"Price cache: no data for {symbol}; keeping the stored history")
+
+        refreshed = [symbol for symbol in symbols if symbol not in missing]
+        for symbol in refreshed:
+            manifest[symbol]["covered_until"] = today
+            manifest[symbol]["last_date"] = self.store.meta(symbol)["last_date"]
+        if manifest != before:
+            self._save_manifest(manifest)
+        return refreshed
+
+    def collect_garbage(self, dry_run: bool = False) -> List[str]:
+        """Delete legacy CSVs already merged into a dataset (never git-tracked ones); returns the affected paths."""
+        manifest = self.load_manifest()
+        removed = []
+        for symbol, entry in manifest.items():
+            if not self.store.has(symbol):
+                continue
+            for path in self._disposable(entry.get("merged_files", [])):
+                if os.path.exists(path):
+                    removed.append(path)
+                    if not dry_run:
+                        os.remove(path)
+            if not dry_run:
+                entry["merged_files"] = []
+        if not dry_run:
+            self._save_manifest(manifest)
+        return removed
+
+
+price_cache = PriceCache()
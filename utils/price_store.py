@@ -0,0 +1,224 @@
+import io
+import json
+import os
+import uuid
+import numpy as np
+import pandas as pd
+from typing import Annotated, Optional
+import dotenv
+
+dotenv.load_dotenv()
+PRICE_STORE_DIR = os.path.join(os.getenv("DATA_DIR") or "data_cache", "price_store")
+
+
+class PriceStore:
+    """
+    Columnar on-disk store for daily OHLCV series.
+
+    Each dataset lives in its own directory with one `.npy` file per column
+    (`Date` as datetime64[ns], sorted and de-duplicated) plus a `meta.json`.
+    Reads memory-map the columns, so repeated lookups cost no parsing.
+    """
+
+    def __init__(self, root: str = PRICE_STORE_DIR):
+        self.root = root
+
+    def _dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def meta(self, key: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(self._dir(key), "meta.json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def has(self, key: str) -> bool:
+        return self.meta(key) is not None
+
+    def write(
+        self,
+        key: Annotated[str, "dataset key, e.g. the ticker symbol"],
+        data: Annotated[pd.DataFrame, "price frame with a Date column"],
+        **meta,
+    ) -> None:
+        data = normalize_price_frame(data)
+        path = self._dir(key)
+        os.makedirs(path, exist_ok=True)
+        columns = [c for c in data.columns if c != "Date"]
+        np.save(os.path.join(path, "Date.npy"), data["Date"].values.astype("datetime64[ns]"))
+        for column in columns:
+            np.save(os.path.join(path, f"{column}.npy"), data[column].to_numpy())
+        # A new revision tells derived data (indicator state) to rebuild
+        meta.setdefault("revision", uuid.uuid4().hex)
+        meta.update({
+            "columns": columns,
+            "rows": len(data),
+            "first_date": data["Date"].iloc[0].strftime("%Y-%m-%d") if len(data) else None,
+            "last_date": data["Date"].iloc[-1].strftime("%Y-%m-%d") if len(data) else None,
+        })
+        # meta.json is written last and marks the dataset as complete
+        self._write_meta(key, meta)
+
+    def _write_meta(self, key: str, meta: dict) -> None:
+        path = os.path.join(self._dir(key), "meta.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def append(
+        self,
+        key: Annotated[str, "dataset key, e.g. the ticker symbol"],
+        data: Annotated[pd.DataFrame, "new price rows with a Date column"],
+        **meta,
+    ) -> int:
+        """
+        Append rows dated after the dataset's last date, keeping its revision
+        so derived indicator state can be updated incrementally. The column
+        files are extended in place and meta.json is replaced last, so the cost
+        is proportional to the new rows. Extra keyword arguments are merged
+        into the metadata. Returns the number of rows added.
+        """
+        current = self.meta(key)
+        if current is None:
+            self.write(key, data, **meta)
+            return self.meta(key)["rows"]
+
+        added = 0
+        if not data.empty:
+            data = normalize_price_frame(data)
+            data = data[data["Date"] > pd.Timestamp(current["last_date"])]
+            added = len(data)
+        if added:
+            path = self._dir(key)
+            rows = current["rows"]
+            columns = {"Date": data["Date"].values.astype("datetime64[ns]")}
+            columns.update({column: data[column].to_numpy() for column in current["columns"]})
+            if not all(_append_npy(os.path.join(path, f"{c}.npy"), rows, v, dry_run=True) for c, v in columns.items()):
+                # A value the stored column type cannot hold (e.g. NaN volume): rewrite everything
+                merged = pd.concat([self.read(key), data[["Date"] + current["columns"]]], ignore_index=True)
+                current.update(meta)
+                self.write(key, merged, **current)
+                return added
+            for column, values in columns.items():
+                _append_npy(os.path.join(path, f"{column}.npy"), rows, values)
+            current.update(meta)
+            current["rows"] = rows + added
+            current["last_date"] = data["Date"].iloc[-1].strftime("%Y-%m-%d")
+        else:
+            current.update(meta)
+        # meta.json last: until it is replaced, readers see the old row count
+        self._write_meta(key, current)
+        return added
+
+    def read(
+        self,
+        key: Annotated[str, "dataset key, e.g. the ticker symbol"],
+        start_date: Annotated[Optional[str], "first date to include, YYYY-mm-dd"] = None,
+        end_date: Annotated[Optional[str], "last date to include, YYYY-mm-dd"] = None,
+    ) -> pd.DataFrame:
+        """Load a dataset (optionally a date range, located by binary search) from memory-mapped columns."""
+        meta = self.meta(key)
+        if meta is None:
+            raise FileNotFoundError(f"No price data stored for {key}")
+        path = self._dir(key)
+        # Columns may hold rows of an append that has not committed meta.json yet
+        dates = np.load(os.path.join(path, "Date.npy"), mmap_mode="r")[: meta["rows"]]
+        lo = dates.searchsorted(np.datetime64(start_date, "ns")) if start_date else 0
+        hi = dates.searchsorted(np.datetime64(end_date, "ns"), side="right") if end_date else len(dates)
+
+        frame = {"Date": np.asarray(dates[lo:hi])}
+        for column in meta["columns"]:
+            frame[column] = np.asarray(np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")[lo:hi])
+        return pd.DataFrame(frame)
+
+    def read_columns(
+        self,
+        key: Annotated[str, "dataset key, e.g. the ticker symbol"],
+        columns: Annotated[list, "column names to map"],
+        start_row: Annotated[int, "first row to return"] = 0,
+    ) -> dict:
+        """Memory-mapped column arrays (no copy) from `start_row` to the end."""
+        path = self._dir(key)
+        rows = self.meta(key)["rows"]
+        return {
+            column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")[start_row:rows]
+            for column in columns
+        }
+
+    def import_csv(
+        self,
+        csv_path: Annotated[str, "path to a Yahoo Finance CSV export"],
+        key: Annotated[Optional[str], "dataset key, defaults to the CSV file name"] = None,
+    ) -> str:
+        """Make sure the store holds the CSV's data, parsing it only when the file changed; returns the key."""
+        key = key or os.path.splitext(os.path.basename(csv_path))[0]
+        meta = self.meta(key)
+        if os.path.exists(csv_path):
+            mtime = os.path.getmtime(csv_path)
+            if meta is None or meta.get("source") != csv_path or meta.get("source_mtime") != mtime:
+                self.write(key, pd.read_csv(csv_path), source=csv_path, source_mtime=mtime)
+        elif meta is None:
+            raise FileNotFoundError(csv_path)
+        return key
+
+    def load_csv(
+        self,
+        csv_path: Annotated[str, "path to a Yahoo Finance CSV export"],
+        key: Annotated[Optional[str], "dataset key, defaults to the CSV file name"] = None,
+    ) -> pd.DataFrame:
+        """Read a CSV through the store: it is parsed once and re-imported only when the file changes."""
+        return self.read(self.import_csv(csv_path, key))
+
+
+def _append_npy(path: str, rows: int, values: np.ndarray, dry_run: bool = False) -> bool:
+    """
+    Append to a 1-D .npy file in place: drop anything past `rows`, write the
+    new values and rewrite the header's shape. Returns False (writing nothing)
+    when the values do not fit the stored dtype or the longer shape does not
+    fit the existing header.
+    """
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version not in ((1, 0), (2, 0)):
+            return False
+        read_header, write_header = (
+            (np.lib.format.read_array_header_1_0, np.lib.format.write_array_header_1_0)
+            if version == (1, 0)
+            else (np.lib.format.read_array_header_2_0, np.lib.format.write_array_header_2_0)
+        )
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+        if len(shape) != 1 or not np.can_cast(values.dtype, dtype, casting="same_kind"):
+            return False
+        header = io.BytesIO()
+        write_header(header, {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": fortran_order,
+            "shape": (rows + len(values),),
+        })
+        if header.tell() != offset:
+            return False
+        if dry_run:
+            return True
+        f.seek(offset + rows * dtype.itemsize)
+        f.truncate()
+        f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+        f.seek(0)
+        f.write(header.getvalue())
+    return True
+
+
+def normalize_price_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """Typed, date-sorted copy of a price frame with a tz-naive, day-resolution `Date` column."""
+    data = data.copy()
+    if "Date" not in data.columns:
+        data = data.reset_index()
+    # Keep only the calendar day; Yahoo exports may carry a time and UTC offset.
+    data["Date"] = pd.to_datetime(data["Date"].astype(str).str[:10])
+    data = data.sort_values("Date").drop_duplicates("Date", keep="last")
+    return data.reset_index(drop=True)
+
+
+price_store = PriceStore()
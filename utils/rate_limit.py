@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Annotated, Dict, Optional
+from urllib.parse import urlsplit
+import dotenv
+
+dotenv.load_dotenv()
+# Budget for hosts without an explicit configure() call
+DEFAULT_RATE = float(os.getenv("RATE_LIMIT_RATE", "1.0"))
+DEFAULT_BURST = float(os.getenv("RATE_LIMIT_BURST", "5"))
+# Back-off after a 429 without Retry-After: 4s, 8s, ... up to 60s
+BACKOFF_MIN = 4.0
+BACKOFF_MAX = 60.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second up to `capacity`.
+    acquire() only sleeps once the burst budget is spent; callers waiting at
+    the same time queue up behind each other (the balance goes negative).
+    A server-side rate limit (429 / Retry-After) blocks the bucket outright.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.strikes = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until it is available; returns the seconds waited."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate, self.blocked_until - now, 0.0)
+        waited = 0.0
+        while wait > 0:
+            time.sleep(wait)
+            waited += wait
+            # A back-off may have been reported while this caller slept
+            with self.lock:
+                wait = self.blocked_until - time.monotonic()
+        return waited
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now; never waits."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens < 1 or self.blocked_until > now:
+                return False
+            self.tokens -= 1
+            return True
+
+    def block(self, seconds: float):
+        """Hold every caller for `seconds` and drop any accumulated burst."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.blocked_until = max(self.blocked_until, now + seconds)
+            self.tokens = min(self.tokens, 0.0)
+
+    def feedback(self, status_code: int, retry_after: Optional[str] = None):
+        """Adjust to a response: back off on 429 (or a 503 with Retry-After), reset on success."""
+        delay = parse_retry_after(retry_after)
+        with self.lock:
+            if status_code == 429 or (status_code == 503 and delay is not None):
+                if delay is None:
+                    delay = min(BACKOFF_MAX, BACKOFF_MIN * 2 ** self.strikes)
+                self.strikes += 1
+            else:
+                if status_code < 400:
+                    self.strikes = 0
+                return
+        self.block(delay)
+
+
+class RateLimiter:
+    """Process-wide token buckets keyed by host name."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def configure(
+        self,
+        host: Annotated[str, "host name, e.g. www.google.com"],
+        rate: Annotated[float, "requests per second"],
+        capacity: Annotated[float, "burst size"],
+    ) -> TokenBucket:
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(rate, capacity)
+            else:
+                bucket.rate, bucket.capacity = rate, capacity
+            return bucket
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).hostname or url
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.capacity)
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Wait for the URL's host budget; returns the seconds waited."""
+        return self.bucket(url).acquire()
+
+    def try_acquire(self, url: str) -> bool:
+        """Take a token for the URL's host if one is available without waiting."""
+        return self.bucket(url).try_acquire()
+
+    def feedback(self, url: str, response) -> None:
+        """Report a response (anything with status_code and headers) for the URL's host."""
+        self.bucket(url).feedback(response.status_code, response.headers.get("Retry-After"))
+
+
+rate_limiter = RateLimiter()
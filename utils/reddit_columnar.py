@@ -0,0 +1,281 @@
+"""
+Columnar (Parquet) cache of the Reddit JSONL dumps.
+
+convert_category() turns each `<data_path>/<category>/<subreddit>.jsonl`
+into `<data_path>/.columnar/<category>/<subreddit>.parquet` holding only the
+fields the fetchers use: a dictionary-encoded subreddit, the line's byte
+offset in the dump (for ranking ties), a float64 created_utc, large-string
+title / selftext, url and ups. Rows are sorted by created_utc and written in
+small row groups, so date-range reads skip everything outside the range
+(predicate pushdown on the row-group statistics) and are memory-mapped.
+
+A manifest records each dump's size and mtime at conversion time; a dump
+that changed afterwards is read from the JSONL again until re-converted.
+pyarrow is optional: without it the cache is never used.
+
+    python -m utils.reddit_columnar [data_path] [category ...]
+"""
+
+import json
+import os
+import sys
+import numpy as np
+from typing import Annotated, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+
+from .reddit_decode import RedditPost, decode_post
+from .reddit_index import iter_range_entries
+
+COLUMNAR_DIRNAME = ".columnar"
+ROW_GROUP_SIZE = 16384
+# Posts decoded and sorted in memory at once while converting, and rows
+# read from each sorted run per merge step
+RUN_ROWS = 131072
+MERGE_BATCH_ROWS = 2048
+
+SCHEMA = None
+if pa is not None:
+    SCHEMA = pa.schema([
+        ("subreddit", pa.dictionary(pa.int32(), pa.string())),
+        ("offset", pa.int64()),
+        ("created_utc", pa.float64()),
+        ("title", pa.large_string()),
+        ("selftext", pa.large_string()),
+        ("url", pa.string()),
+        ("ups", pa.int64()),
+    ])
+
+
+def columnar_dir(data_path: str, category: str) -> str:
+    return os.path.join(data_path, COLUMNAR_DIRNAME, category)
+
+
+def columnar_path(data_path: str, category: str, data_file: str) -> str:
+    return os.path.join(columnar_dir(data_path, category), f"{os.path.splitext(data_file)[0]}.parquet")
+
+
+def load_manifest(data_path: str, category: str) -> dict:
+    try:
+        with open(os.path.join(columnar_dir(data_path, category), "manifest.json"), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(data_path: str, category: str, manifest: dict):
+    path = os.path.join(columnar_dir(data_path, category), "manifest.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def has_columnar(
+    data_path: str, category: str, data_file: str, manifest: Optional[dict] = None
+) -> bool:
+    """Whether the dump has an up-to-date columnar copy (and pyarrow can read it)."""
+    if pa is None:
+        return False
+    entry = (manifest if manifest is not None else load_manifest(data_path, category)).get(data_file)
+    if not entry or not os.path.exists(columnar_path(data_path, category, data_file)):
+        return False
+    stat = os.stat(os.path.join(data_path, category, data_file))
+    return entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime
+
+
+SORT_KEYS = [("created_utc", "ascending"), ("offset", "ascending")]
+
+
+def _sorted_table(columns: dict, subreddit: str) -> "pa.Table":
+    rows = len(columns["offset"])
+    table = pa.table(
+        [
+            pa.DictionaryArray.from_arrays(
+                pa.array(np.zeros(rows, dtype=np.int32)), pa.array([subreddit], pa.string())
+            ),
+            *(pa.array(columns[field.name], field.type) for field in list(SCHEMA)[1:]),
+        ],
+        schema=SCHEMA,
+    )
+    return table.take(pc.sort_indices(table, SORT_KEYS))
+
+
+def _spill_runs(source: str, spill_path: str, subreddit: str) -> int:
+    """Decode the dump into sorted runs of RUN_ROWS rows, one row group each; returns the row count."""
+    names = ("offset", "created_utc", "title", "selftext", "url", "ups")
+    columns = {name: [] for name in names}
+    rows = 0
+    with pq.ParquetWriter(spill_path, SCHEMA) as writer, open(source, "rb") as f:
+        def flush():
+            if columns["offset"]:
+                run = _sorted_table(columns, subreddit)
+                writer.write_table(run, row_group_size=len(run))
+                for name in names:
+                    columns[name].clear()
+
+        for offset, line in iter_range_entries(f):
+            # skip empty lines
+            if not line.strip():
+                continue
+            post = decode_post(line)
+            columns["offset"].append(offset)
+            columns["created_utc"].append(post.created_utc)
+            columns["title"].append(post.title)
+            columns["selftext"].append(post.selftext)
+            columns["url"].append(post.url)
+            columns["ups"].append(post.ups)
+            rows += 1
+            if len(columns["offset"]) >= RUN_ROWS:
+                flush()
+        flush()
+    return rows
+
+
+class _Run:
+    """Cursor over one sorted run of the spill file, MERGE_BATCH_ROWS rows at a time."""
+
+    def __init__(self, spill: "pq.ParquetFile", row_group: int):
+        self.batches = spill.iter_batches(batch_size=MERGE_BATCH_ROWS, row_groups=[row_group])
+        self.table = None
+        self.fill()
+
+    def fill(self) -> bool:
+        """Load the next batch once the current one is used up; False when the run is exhausted."""
+        while self.table is None or self.table.num_rows == 0:
+            batch = next(self.batches, None)
+            if batch is None:
+                self.table = None
+                return False
+            self.table = pa.Table.from_batches([batch])
+            self.created = self.table["created_utc"].to_numpy()
+            self.offsets = self.table["offset"].to_numpy()
+        return True
+
+    def last_key(self) -> tuple:
+        return self.created[-1], self.offsets[-1]
+
+    def take_through(self, key: tuple) -> "pa.Table":
+        """Remove and return the leading rows with (created_utc, offset) <= key."""
+        created, offset = key
+        lo = int(np.searchsorted(self.created, created, side="left"))
+        hi = int(np.searchsorted(self.created, created, side="right"))
+        n = lo + int(np.searchsorted(self.offsets[lo:hi], offset, side="right"))
+        head = self.table.slice(0, n)
+        self.table = self.table.slice(n)
+        self.created, self.offsets = self.created[n:], self.offsets[n:]
+        return head
+
+
+def _merge_runs(spill_path: str, out_path: str):
+    """k-way merge of the sorted runs into row groups of ROW_GROUP_SIZE rows."""
+    spill = pq.ParquetFile(spill_path)
+    runs = [_Run(spill, i) for i in range(spill.num_row_groups)]
+    runs = [run for run in runs if run.table is not None]
+    pending = []
+    pending_rows = 0
+    with pq.ParquetWriter(out_path, SCHEMA, compression="zstd") as writer:
+        while runs:
+            # Every row up to the smallest batch tail is final: no run can still produce a smaller key
+            cutoff = min(run.last_key() for run in runs)
+            heads = [run.take_through(cutoff) for run in runs]
+            merged = pa.concat_tables([head for head in heads if head.num_rows])
+            pending.append(merged.take(pc.sort_indices(merged, SORT_KEYS)))
+            pending_rows += merged.num_rows
+            runs = [run for run in runs if run.fill()]
+
+            if pending_rows >= ROW_GROUP_SIZE or not runs:
+                table = pa.concat_tables(pending)
+                full = len(table) if not runs else len(table) - len(table) % ROW_GROUP_SIZE
+                if full:
+                    writer.write_table(table.slice(0, full), row_group_size=ROW_GROUP_SIZE)
+                pending = [table.slice(full)] if full < len(table) else []
+                pending_rows = len(table) - full
+
+
+def convert_file(
+    data_path: Annotated[str, "Path to the data folder."],
+    category: Annotated[str, "Category folder of the subreddit file."],
+    data_file: Annotated[str, "Subreddit .jsonl file name."],
+) -> dict:
+    """
+    Write the columnar copy of one dump; returns its manifest entry.
+    Memory stays bounded on multi-GB dumps: posts are decoded into sorted
+    runs of RUN_ROWS rows spilled to a temporary Parquet file, which are then
+    merged into the time-sorted output through a ParquetWriter.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to build the Reddit columnar cache")
+    source = os.path.join(data_path, category, data_file)
+    stat = os.stat(source)
+
+    path = columnar_path(data_path, category, data_file)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    spill_path = f"{path}.{os.getpid()}.spill"
+    try:
+        rows = _spill_runs(source, spill_path, os.path.splitext(data_file)[0])
+        # Sorted by time so row-group min/max statistics prune date-range reads
+        _merge_runs(spill_path, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        for leftover in (spill_path, tmp_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "rows": rows}
+
+
+def convert_category(
+    category: Annotated[str, "Category to convert. Collection of subreddits."],
+    data_path: Annotated[str, "Path to the data folder."] = "reddit_data",
+    force: Annotated[bool, "Re-convert dumps whose columnar copy is up to date."] = False,
+) -> int:
+    """(Re)convert every changed .jsonl dump of a category; returns the number of files converted."""
+    manifest = load_manifest(data_path, category)
+    count = 0
+    for data_file in os.listdir(os.path.join(data_path, category)):
+        if not data_file.endswith(".jsonl"):
+            continue
+        if not force and has_columnar(data_path, category, data_file, manifest):
+            continue
+        manifest[data_file] = convert_file(data_path, category, data_file)
+        _save_manifest(data_path, category, manifest)
+        count += 1
+    return count
+
+
+def iter_columnar_posts(
+    data_path: str, category: str, data_file: str, start_utc: float, end_utc: float
+) -> Iterator[Tuple[int, RedditPost]]:
+    """(offset, post) for the dump's posts with start_utc <= created_utc < end_utc."""
+    table = pq.read_table(
+        columnar_path(data_path, category, data_file),
+        columns=["offset", "created_utc", "title", "selftext", "url", "ups"],
+        filters=[("created_utc", ">=", start_utc), ("created_utc", "<", end_utc)],
+        memory_map=True,
+    )
+    columns = table.to_pydict()
+    for offset, created_utc, title, selftext, url, ups in zip(
+        columns["offset"], columns["created_utc"], columns["title"],
+        columns["selftext"], columns["url"], columns["ups"],
+    ):
+        yield offset, RedditPost(created_utc, title, selftext, url, ups)
+
+
+def _main(argv: List[str]):
+    data_path = argv[0] if argv else "reddit_data"
+    categories = argv[1:] or [
+        name for name in sorted(os.listdir(data_path))
+        if not name.startswith(".") and os.path.isdir(os.path.join(data_path, name))
+    ]
+    for category in categories:
+        print(f"{category}: converted {convert_category(category, data_path)} file(s)")
+
+
+if __name__ == "__main__":
+    _main(sys.argv[1:])
@@ -0,0 +1,79 @@
+"""
+Decoding of Reddit JSONL dump lines.
+
+Only created_utc, title, selftext, url and ups are used downstream, so lines
+are decoded straight into a small RedditPost record: with msgspec (typed
+struct, unknown fields skipped without being materialised) when installed,
+else orjson, else the standard json module. in_time_range() rejects lines
+outside a date range from the raw bytes, before any decoding.
+"""
+
+import json
+from typing import NamedTuple
+
+try:
+    import msgspec
+except ImportError:  # optional speed-up
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+from .reddit_index import CREATED_UTC_RE
+
+
+if msgspec is not None:
+
+    class RedditPost(msgspec.Struct):
+        created_utc: float
+        title: str
+        selftext: str
+        url: str
+        ups: int
+
+    # strict=False accepts created_utc stored as a string, like float() did
+    _decoder = msgspec.json.Decoder(RedditPost, strict=False)
+
+    def decode_post(line: bytes) -> RedditPost:
+        try:
+            return _decoder.decode(line)
+        except msgspec.ValidationError:
+            # Unusual field types (e.g. null selftext): take the slow path
+            return _project(json.loads(line))
+
+else:
+
+    class RedditPost(NamedTuple):
+        created_utc: float
+        title: str
+        selftext: str
+        url: str
+        ups: int
+
+    _loads = orjson.loads if orjson is not None else json.loads
+
+    def decode_post(line: bytes) -> RedditPost:
+        return _project(_loads(line))
+
+
+def _project(parsed_line: dict) -> RedditPost:
+    return RedditPost(
+        created_utc=float(parsed_line["created_utc"]),
+        title=parsed_line["title"],
+        selftext=parsed_line["selftext"],
+        url=parsed_line["url"],
+        ups=parsed_line["ups"],
+    )
+
+
+def in_time_range(line: bytes, start: float, end: float) -> bool:
+    """
+    Cheap pre-filter on the raw line: False only when it has created_utc
+    values and none falls in [start, end), so the post cannot be in range.
+    Any match (possibly a nested crosspost's) lets the line through, and the
+    decoded post is checked again by the caller.
+    """
+    values = CREATED_UTC_RE.findall(line)
+    return not values or any(start <= float(value) < end for value in values)
@@ -0,0 +1,132 @@
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Annotated, Dict, Iterator, List, Optional, Tuple
+
+# Indexes live outside the category folders so they never count as subreddit files
+INDEX_DIRNAME = ".index"
+
+CREATED_UTC_RE = re.compile(rb'"created_utc"\s*:\s*"?(-?\d+(?:\.\d+)?)')
+
+
+def post_day(created_utc: float) -> str:
+    return datetime.fromtimestamp(float(created_utc), timezone.utc).strftime("%Y-%m-%d")
+
+
+def line_created_utc(line: bytes) -> float:
+    """created_utc of a raw JSONL line, read without decoding the whole post when possible."""
+    matches = CREATED_UTC_RE.findall(line)
+    if len(matches) == 1:
+        return float(matches[0])
+    # Missing, or also present in nested objects (crossposts): decode properly
+    return float(json.loads(line)["created_utc"])
+
+
+def index_path(data_path: str, category: str, data_file: str) -> str:
+    return os.path.join(data_path, INDEX_DIRNAME, category, f"{data_file}.json")
+
+
+def build_day_index(
+    file_path: Annotated[str, "path to a subreddit .jsonl dump"],
+    previous: Annotated[dict, "existing index to extend, if the file only grew"] = None,
+) -> dict:
+    """Map each UTC day to the byte offsets of its posts in the file."""
+    days: Dict[str, List[int]] = {}
+    start = 0
+    if previous:
+        days = {day: list(offsets) for day, offsets in previous["days"].items()}
+        start = previous["size"]
+
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if line.strip():
+                days.setdefault(post_day(line_created_utc(line)), []).append(offset)
+            offset += len(line)
+
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "days": days}
+
+
+def load_day_index(
+    data_path: Annotated[str, "Path to the data folder."],
+    category: Annotated[str, "Category folder of the subreddit file."],
+    data_file: Annotated[str, "Subreddit .jsonl file name."],
+) -> dict:
+    """Load the day index for a file, building or extending it when the file changed."""
+    file_path = os.path.join(data_path, category, data_file)
+    path = index_path(data_path, category, data_file)
+    stat = os.stat(file_path)
+
+    index = None
+    try:
+        with open(path, "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if index and index["size"] == stat.st_size and index["mtime"] == stat.st_mtime:
+        return index
+
+    # Dumps are append-only: if the file only grew, index just the new tail
+    previous = index if index and index["size"] < stat.st_size else None
+    index = build_day_index(file_path, previous)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, path)
+    return index
+
+
+def build_category_index(
+    category: Annotated[str, "Category to index. Collection of subreddits."],
+    data_path: Annotated[str, "Path to the data folder."] = "reddit_data",
+) -> int:
+    """One-time (re)indexing of every .jsonl file in a category; returns the number of files indexed."""
+    count = 0
+    for data_file in os.listdir(os.path.join(data_path, category)):
+        if data_file.endswith(".jsonl"):
+            load_day_index(data_path, category, data_file)
+            count += 1
+    return count
+
+
+def iter_day_entries(
+    f, index: dict, days: List[str], start: int = 0, end: Optional[int] = None
+) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, raw line) for the given days' posts within [start, end), in file order."""
+    offsets = sorted(
+        o for day in days for o in index["days"].get(day, ())
+        if o >= start and (end is None or o < end)
+    )
+    for offset in offsets:
+        f.seek(offset)
+        yield offset, f.readline()
+
+
+def iter_day_lines(f, index: dict, days: List[str]) -> Iterator[bytes]:
+    """Yield the raw lines of the given days by seeking to their offsets, in file order."""
+    for _, line in iter_day_entries(f, index, days):
+        yield line
+
+
+def iter_range_entries(f, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield (offset, raw line) for every line starting in [start, end). A
+    line straddling `start` belongs to the previous range.
+    """
+    offset = start
+    f.seek(start)
+    if start > 0:
+        f.seek(start - 1)
+        offset = start - 1 + len(f.readline())
+    while end is None or offset < end:
+        line = f.readline()
+        if not line:
+            break
+        yield offset, line
+        offset += len(line)
@@ -1,8 +1,23 @@
-import json
-from datetime import datetime
-from typing import Annotated
+import heapq
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Dict, Iterator, List, Optional, Tuple
 import os
-import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from .company_matcher import CompanyMatcher
+from .reddit_columnar import has_columnar, iter_columnar_posts
+from .reddit_decode import RedditPost, decode_post, in_time_range
+from .reddit_index import (
+    load_day_index,
+    iter_day_lines,
+    iter_day_entries,
+    iter_range_entries,
+    post_day,
+)
+
+# Files are only split into byte-range chunks when each chunk gets at least this much
+SCAN_CHUNK_MIN_BYTES = 32 * 1024 * 1024
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -46,6 +61,17 @@ ticker_to_company = {
 }
 
 
+def company_aliases(ticker: str) -> list:
+    """Search terms for a ticker: its company names plus the ticker itself."""
+    return ticker_to_company[ticker].split(" OR ") + [ticker]
+
+
+@lru_cache(maxsize=64)
+def get_company_matcher(tickers: tuple) -> CompanyMatcher:
+    """Matcher for a set of tickers, compiled once and reused across calls."""
+    return CompanyMatcher({ticker: company_aliases(ticker) for ticker in tickers})
+
+
 def fetch_top_from_category(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
@@ -57,6 +83,9 @@ def fetch_top_from_category(
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
+    use_index: Annotated[
+        bool, "Seek to the date's posts through the per-day offset index."
+    ] = True,
 ):
     base_path = data_path
 
@@ -79,46 +108,34 @@ def fetch_top_from_category(
         all_content_curr_subreddit = []
 
         with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
+            if use_index:
+                lines = iter_day_lines(f, load_day_index(base_path, category, data_file), [date])
+            else:
+                lines = f
+            for i, line in enumerate(lines):
                 # skip empty lines
                 if not line.strip():
                     continue
 
-                parsed_line = json.loads(line)
+                parsed_line = decode_post(line)
 
                 # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
+                post_date = post_day(parsed_line.created_utc)
                 if post_date != date:
                     continue
 
                 # if is company_news, check that the title or the content has the company's name (query) mentioned
                 if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
+                    if not get_company_matcher((query,)).mentions(
+                        query, parsed_line.title, parsed_line.selftext
+                    ):
                         continue
 
                 post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
+                    "title": parsed_line.title,
+                    "content": parsed_line.selftext,
+                    "url": parsed_line.url,
+                    "upvotes": parsed_line.ups,
                     "posted_date": post_date,
                 }
 
@@ -130,3 +147,303 @@ def fetch_top_from_category(
         all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
 
     return all_content
+
+
+def _date_range(start_date: str, end_date: str) -> List[str]:
+    first_day = datetime.strptime(start_date, "%Y-%m-%d")
+    return [
+        (first_day + timedelta(days=i)).strftime("%Y-%m-%d")
+        for i in range((datetime.strptime(end_date, "%Y-%m-%d") - first_day).days + 1)
+    ]
+
+
+def _limit_per_subreddit(base_path: str, category: str, max_limit_per_day: int) -> int:
+    data_files = os.listdir(os.path.join(base_path, category))
+
+    if max_limit_per_day < len(data_files):
+        raise ValueError(
+            "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
+        )
+
+    return max_limit_per_day // len(data_files)
+
+
+def _file_posts(
+    base_path: str,
+    category: str,
+    data_file: str,
+    days: List[str],
+    use_index: bool,
+    byte_range: Optional[Tuple[int, int]],
+) -> Iterator[Tuple[int, RedditPost]]:
+    """(byte offset, post) for the file's posts that may fall on `days`."""
+    # [first day 00:00, day after the last day 00:00) in UTC
+    range_start = datetime.strptime(days[0], "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+    range_end = range_start + len(days) * 86400
+
+    if byte_range is None and has_columnar(base_path, category, data_file):
+        # Up-to-date Parquet copy: only row groups overlapping the range are read
+        yield from iter_columnar_posts(base_path, category, data_file, range_start, range_end)
+        return
+
+    start, end = byte_range or (0, None)
+    with open(os.path.join(base_path, category, data_file), "rb") as f:
+        if use_index:
+            entries = iter_day_entries(
+                f, load_day_index(base_path, category, data_file), days, start, end
+            )
+        else:
+            entries = iter_range_entries(f, start, end)
+        for offset, line in entries:
+            # skip empty lines
+            if not line.strip():
+                continue
+
+            # indexed lines are already in range; streamed ones are checked before decoding
+            if not use_index and not in_time_range(line, range_start, range_end):
+                continue
+
+            yield offset, decode_post(line)
+
+
+def top_posts_in_file(
+    base_path: str,
+    category: str,
+    data_file: str,
+    days: List[str],
+    limit_per_subreddit: int,
+    tickers: Optional[tuple] = None,
+    use_index: bool = True,
+    byte_range: Optional[Tuple[int, int]] = None,
+) -> Dict[Optional[str], Dict[str, list]]:
+    """
+    Top posts by upvotes per day in one subreddit file (or the lines starting
+    in `byte_range` of it), read once. With `tickers`, each post is routed to
+    every ticker it mentions and ranked per (ticker, day); without, all posts
+    are ranked under the key None.
+
+    Dumps with an up-to-date columnar copy (see reddit_columnar) are read
+    from it instead of the JSONL when no byte range is given.
+
+    Returns the ranked (upvotes, -byte offset, post) entries, best first, so
+    results of several chunks of a file can be merged exactly (merge_top_posts).
+    Runs in scan worker processes, so it only takes picklable arguments.
+    """
+    keys = list(tickers) if tickers else [None]
+    matcher = get_company_matcher(tuple(tickers)) if tickers else None
+    # per-(key, day) min-heaps of (upvotes, -offset, post); ties keep the earlier post
+    heaps = {key: {day: [] for day in days} for key in keys}
+
+    for offset, parsed_line in _file_posts(base_path, category, data_file, days, use_index, byte_range):
+        post_date = post_day(parsed_line.created_utc)
+        if post_date not in heaps[keys[0]]:
+            continue
+
+        if matcher is not None:
+            matched = matcher.match(parsed_line.title, parsed_line.selftext)
+        else:
+            matched = keys
+
+        post = None
+        item = (parsed_line.ups, -offset)
+        for key in matched:
+            heap = heaps[key][post_date]
+            if len(heap) >= limit_per_subreddit and item <= heap[0][:2]:
+                continue
+
+            if post is None:
+                post = {
+                    "title": parsed_line.title,
+                    "content": parsed_line.selftext,
+                    "url": parsed_line.url,
+                    "upvotes": parsed_line.ups,
+                    "posted_date": post_date,
+                }
+            if len(heap) < limit_per_subreddit:
+                heapq.heappush(heap, item + (post,))
+            else:
+                heapq.heapreplace(heap, item + (post,))
+
+    return {
+        key: {day: sorted(heap, reverse=True) for day, heap in by_day.items()}
+        for key, by_day in heaps.items()
+    }
+
+
+def merge_top_posts(parts: List[dict], keys: list, days: List[str], limit_per_subreddit: int) -> dict:
+    """Combine top_posts_in_file results for chunks of the same file into its top-k posts."""
+    if len(parts) == 1:
+        return {
+            key: {day: [entry[2] for entry in parts[0][key][day]] for day in days}
+            for key in keys
+        }
+    return {
+        key: {
+            day: [
+                entry[2]
+                for entry in heapq.nlargest(
+                    limit_per_subreddit,
+                    (entry for part in parts for entry in part[key][day]),
+                    key=lambda entry: entry[:2],
+                )
+            ]
+            for day in days
+        }
+        for key in keys
+    }
+
+
+def scan_workers() -> int:
+    """Scan processes to use by default (REDDIT_SCAN_WORKERS, 1 = scan in-process)."""
+    try:
+        return max(1, int(os.getenv("REDDIT_SCAN_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+_scan_executor = None
+_scan_executor_workers = 0
+_scan_executor_lock = threading.Lock()
+
+
+def _get_scan_executor(workers: int) -> ProcessPoolExecutor:
+    # Kept alive between calls so repeated scans don't pay process start-up
+    global _scan_executor, _scan_executor_workers
+    with _scan_executor_lock:
+        if _scan_executor is None or _scan_executor_workers != workers:
+            if _scan_executor is not None:
+                _scan_executor.shutdown(wait=False)
+            _scan_executor = ProcessPoolExecutor(max_workers=workers)
+            _scan_executor_workers = workers
+        return _scan_executor
+
+
+def _scan_tasks(base_path: str, category: str, data_file: str, workers: int) -> list:
+    """Byte ranges to split a file into so every worker gets a similar share."""
+    size = os.path.getsize(os.path.join(base_path, category, data_file))
+    chunks = max(1, min(workers, size // SCAN_CHUNK_MIN_BYTES))
+    bounds = [size * i // chunks for i in range(chunks)] + [size]
+    return [(bounds[i], bounds[i + 1]) for i in range(chunks)]
+
+
+def _fetch_range(
+    base_path, category, start_date, end_date, max_limit_per_day, tickers, use_index, workers=None
+):
+    limit_per_subreddit = _limit_per_subreddit(base_path, category, max_limit_per_day)
+    days = _date_range(start_date, end_date)
+    keys = list(tickers) if tickers else [None]
+    content = {key: {day: [] for day in days} for key in keys}
+    workers = workers or scan_workers()
+
+    # check if data_file is a .jsonl file
+    data_files = [
+        data_file
+        for data_file in os.listdir(os.path.join(base_path, category))
+        if data_file.endswith(".jsonl")
+    ]
+
+    if workers > 1:
+        if use_index:
+            # Build or refresh indexes up front so workers only read them
+            for data_file in data_files:
+                load_day_index(base_path, category, data_file)
+        executor = _get_scan_executor(workers)
+        futures = {
+            data_file: [
+                executor.submit(
+                    top_posts_in_file, base_path, category, data_file, days,
+                    limit_per_subreddit, tickers, use_index, byte_range,
+                )
+                for byte_range in (
+                    [None]
+                    if has_columnar(base_path, category, data_file)
+                    else _scan_tasks(base_path, category, data_file, workers)
+                )
+            ]
+            for data_file in data_files
+        }
+        parts = {data_file: [future.result() for future in fs] for data_file, fs in futures.items()}
+    else:
+        parts = {
+            data_file: [
+                top_posts_in_file(
+                    base_path, category, data_file, days, limit_per_subreddit, tickers, use_index
+                )
+            ]
+            for data_file in data_files
+        }
+
+    # Merge in file order, as the sequential scan does
+    for data_file in data_files:
+        top = merge_top_posts(parts[data_file], keys, days, limit_per_subreddit)
+        for key in keys:
+            for day in days:
+                content[key][day].extend(top[key][day])
+
+    return {key: [post for day in days for post in content[key][day]] for key in keys}
+
+
+def fetch_top_from_category_range(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit_per_day: Annotated[int, "Maximum number of posts to fetch per day."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+    use_index: Annotated[
+        bool, "Seek to the range's posts through the per-day offset index."
+    ] = True,
+    workers: Annotated[
+        Optional[int], "Scan processes; defaults to REDDIT_SCAN_WORKERS (1 = in-process)."
+    ] = None,
+):
+    """
+    Same result as calling fetch_top_from_category for every day from
+    start_date to end_date (inclusive), but each subreddit file is read once.
+    Posts are bucketed by day and only a bounded top-k heap by upvotes is
+    kept per (subreddit, day), so memory is O(days x k).
+    """
+    tickers = (query,) if "company" in category and query else None
+    result = _fetch_range(
+        data_path, category, start_date, end_date, max_limit_per_day, tickers, use_index,
+        workers,
+    )
+    return result[tickers[0] if tickers else None]
+
+
+def fetch_top_from_category_range_batch(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit_per_day: Annotated[int, "Maximum number of posts to fetch per day, per ticker."],
+    tickers: Annotated[List[str], "Tickers from ticker_to_company to route posts to."],
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+    use_index: Annotated[
+        bool, "Seek to the range's posts through the per-day offset index."
+    ] = True,
+    workers: Annotated[
+        Optional[int], "Scan processes; defaults to REDDIT_SCAN_WORKERS (1 = in-process)."
+    ] = None,
+) -> Dict[str, list]:
+    """
+    fetch_top_from_category_range for several tickers in one pass over the
+    corpus: every post is matched against all tickers at once and ranked in
+    each ticker's own (subreddit, day) heaps. Returns posts per ticker.
+    """
+    tickers = tuple(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+    return _fetch_range(
+        data_path, category, start_date, end_date, max_limit_per_day, tickers, use_index,
+        workers,
+    )
@@ -1,83 +1,126 @@
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
 from typing import Annotated
 import os
 import dotenv
+from .price_store import price_store
+from .price_cache import price_cache
+from .indicator_engine import indicator_engine
 dotenv.load_dotenv()
 DATA_DIR = os.getenv("DATA_DIR")
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def get_price_key(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         online: Annotated[
             bool,
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
-    ):
-        df = None
-        data = None
-
+    ) -> str:
+        """Make sure the price store holds the symbol's history and return its dataset key."""
         if not online:
             try:
-                data = pd.read_csv(
+                return price_store.import_csv(
                     os.path.join(
                         DATA_DIR,
                         f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
                     )
                 )
-                df = wrap(data)
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
         else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
+            # Per-symbol cache: only bars after the last covered date are downloaded
+            return price_cache.refresh(symbol)
 
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
+    @staticmethod
+    def get_price_data(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.DataFrame:
+        return price_store.read(StockstatsUtils.get_price_key(symbol, online))
 
-            # Get config and ensure cache directory exists
-            os.makedirs(DATA_DIR, exist_ok=True)
+    @staticmethod
+    def get_stock_stats_series(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.Series:
+        """Compute an indicator over the full history once, indexed by trading date."""
+        key = StockstatsUtils.get_price_key(symbol, online)
+        if indicator_engine.supports(indicator):
+            # Persisted incremental state: only bars added since the last call are computed
+            return indicator_engine.series(key, indicator)
 
-            data_file = os.path.join(
-                DATA_DIR,
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
+        df = wrap(price_store.read(key))
+        values = df[indicator]  # trigger stockstats to calculate the indicator
+        return pd.Series(
+            values.values, index=pd.DatetimeIndex(df["Date"].values), name=indicator
+        )
 
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
+    @staticmethod
+    def get_stock_stats_frame(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicators: Annotated[
+            list, "quantitative indicators based off of the stock data for the company"
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.DataFrame:
+        """Compute several indicators in one pass over the same wrapped frame, indexed by trading date."""
+        key = StockstatsUtils.get_price_key(symbol, online)
+        # Incremental groups: macd/macds/macdh (and the boll bands) share one update
+        supported = [indicator for indicator in indicators if indicator_engine.supports(indicator)]
+        columns = {
+            indicator: values.values
+            for indicator, values in indicator_engine.frame(key, supported).items()
+        } if supported else {}
 
+        remaining = [indicator for indicator in indicators if indicator not in columns]
+        data = price_store.read(key)
+        if remaining:
             df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+            # stockstats keeps intermediate columns on the frame, so later
+            # indicators reuse what earlier ones computed (EMAs, rolling stats)
+            for indicator in remaining:
+                columns[indicator] = df[indicator].values
+        return pd.DataFrame(
+            {indicator: columns[indicator] for indicator in indicators},
+            index=pd.DatetimeIndex(data["Date"].values),
+        )
+
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        series = StockstatsUtils.get_stock_stats_series(symbol, indicator, online)
 
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        # Dates are sorted, so locate the row by binary search
+        target = pd.Timestamp(pd.to_datetime(curr_date).date())
+        pos = series.index.searchsorted(target)
 
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
+        if pos < len(series) and series.index[pos] == target:
+            indicator_value = series.values[pos]
             return indicator_value
         else:
             return "N/A: Not a trading day (weekend or holiday)"
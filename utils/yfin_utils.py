@@ -1,20 +1,23 @@
 # gets data/stats
 
-import yfinance as yf
-from typing import Annotated, Callable, Any, Optional
+from typing import Annotated, Callable, Any, Dict, List, Optional
 from pandas import DataFrame
 import pandas as pd
 from functools import wraps
 
 from .utils import save_output, SavePathType, decorate_all_methods
+from .fundamentals_cache import fundamentals_cache
+from .price_cache import price_cache
+from .price_store import price_store
 
 
 def init_ticker(func: Callable) -> Callable:
-    """Decorator to initialize yf.Ticker and pass it to the function."""
+    """Decorator to initialize the ticker and pass it to the function."""
 
     @wraps(func)
     def wrapper(symbol: Annotated[str, "ticker symbol"], *args, **kwargs) -> Any:
-        ticker = yf.Ticker(symbol)
+        # Shared yf.Ticker whose fundamentals are served from the persistent cache
+        ticker = fundamentals_cache.ticker(symbol)
         return func(ticker, *args, **kwargs)
 
     return wrapper
@@ -115,3 +118,25 @@ class YFinanceUtils:
         majority_voting_result = row_0[row_0 == max_votes].index.tolist()
 
         return majority_voting_result[0], max_votes
+
+
+def get_stock_data_batch(
+    symbols: Annotated[List[str], "ticker symbols"],
+    start_date: Annotated[
+        str, "start date for retrieving stock price data, YYYY-mm-dd"
+    ],
+    end_date: Annotated[
+        str, "end date for retrieving stock price data, YYYY-mm-dd"
+    ],
+) -> Dict[str, DataFrame]:
+    """
+    Retrieve stock price data for several ticker symbols at once. Every symbol
+    is brought up to date in the local price cache with one grouped download,
+    then the (inclusive) date range is read from the cache. Symbols without
+    data are left out of the result.
+    """
+    keys = price_cache.refresh_many([symbol.upper() for symbol in symbols], start_date=start_date)
+    return {
+        key: price_store.read(key, start_date=start_date, end_date=end_date)
+        for key in keys
+    }